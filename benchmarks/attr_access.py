@@ -0,0 +1,31 @@
+"""Micro-benchmark of the nested access through AttrDict/AttrSeq.
+
+Nested containers are wrapped on their first access only, so a repeated access
+should not depend on the size of the payload. The first one copies a level of it.
+
+    python benchmarks/attr_access.py
+"""
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from spsearch.classes import AttrDict  # noqa: E402
+
+
+def payload(size: int) -> dict:
+    # Shaped like the response of /api/v3/species/countries/id/{id}
+    return {'count': size, 'name': '12419', 'result': [
+        {'code': f'{i:02}', 'country': f'Country {i}', 'presence': 'Extant', 'origin': 'Native',
+         'distribution_code': 'Native'} for i in range(size)]}
+
+
+if __name__ == '__main__':
+    number = 20000
+    print(f"{'items':>8} {'first access':>14} {'repeated access':>16}")
+    for size in (10, 1000, 100000):
+        data = payload(size)
+        first = timeit.timeit('AttrDict(data).result[0].code', globals=globals(), number=number // 10) / (number // 10)
+        d = AttrDict(data)
+        repeated = timeit.timeit('d.result[0].code', globals=globals(), number=number) / number
+        print(f'{size:>8} {first * 1e6:>12.2f}us {repeated * 1e6:>14.2f}us')
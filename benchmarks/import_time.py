@@ -0,0 +1,50 @@
+"""Cold-start cost of importing each provider, measured by `python -X importtime`.
+
+Each import runs in a fresh interpreter, and the best of `--repeat` runs is reported,
+together with whether aiohttp was imported on the way.
+
+    python benchmarks/import_time.py [--repeat 5]
+"""
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+statements = {
+    'spsearch': 'import spsearch',
+    'redlist': 'from spsearch.redlist import RedListApiHandler',
+    'redlist.Species': 'from spsearch.redlist import Species',
+    'eol.classic': 'from spsearch.eol.classic import search',
+    'eol.cypher': 'from spsearch.eol.cypher import CypherExecutor',
+    'gbif': 'from spsearch.gbif import Species',
+    'iNaturalist': 'from spsearch.iNaturalist import taxon_search',
+}
+
+# import time: self [us] | cumulative | imported package
+_line = re.compile(r'import time:\s*(\d+) \|\s*(\d+) \| ( *)(\S+)')
+
+
+def import_time(statement: str):
+    """Returns (cumulative microseconds of the top-level imports, names of the imported modules)."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], stderr=subprocess.PIPE,
+                            universal_newlines=True, cwd=str(Path(__file__).resolve().parent.parent), check=True)
+    total, modules = 0, set()
+    for match in _line.finditer(result.stderr):
+        modules.add(match.group(4))
+        # Only the outermost imports, as the cumulative time includes the nested ones
+        if not match.group(3):
+            total += int(match.group(2))
+    return total, modules
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'provider':<16} {'import time':>12} {'modules':>8} {'aiohttp':>8}")
+    for name, statement in statements.items():
+        runs = [import_time(statement) for _ in range(args.repeat)]
+        best, modules = min(runs, key=lambda run: run[0])
+        print(f"{name:<16} {best / 1000:>10.1f}ms {len(modules):>8} {'yes' if 'aiohttp' in modules else 'no':>8}")
@@ -17,14 +17,13 @@ setup(
     author_email='ogran.std@gmail.com',
     license='GPL-3.0',
     keywords='bioinformatics biology biodiversity species',
-    python_requires='>=3.6, <4',
+    python_requires='>=3.7, <4',
     packages=['spsearch'],
     install_requires=['aiohttp>=3.3.0'],
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
         'Topic :: Scientific/Engineering :: Bio-Informatics',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
     ],
 )
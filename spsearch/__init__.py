@@ -0,0 +1,5 @@
+from ._lazy import lazy
+
+# Providers are imported on first access, so that using one of them does not pay for the others
+__all__ = ['eol', 'gbif', 'iNaturalist', 'redlist']
+__getattr__, __dir__ = lazy(__name__, globals(), {name: f'.{name}' for name in __all__})
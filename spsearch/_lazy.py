@@ -0,0 +1,35 @@
+import importlib
+
+
+# Annotated without `typing`, which costs more to import than the package itself
+def lazy(package: str, namespace: dict, attributes: dict) -> tuple:
+    """Makes `__getattr__` and `__dir__` (PEP 562) for a package which imports its attributes on first access.
+
+    Parameters
+    ----------
+    package
+        `__name__` of the package.
+    namespace
+        `globals()` of the package, where the imported attributes are kept.
+    attributes
+        Attribute name to the relative name of the module which has it, e.g. {'Page': '.page'}.
+        An attribute named the same as the module (e.g. {'classic': '.classic'}) is the module itself.
+
+    Example
+    =======
+    __getattr__, __dir__ = lazy(__name__, globals(), {'Species': '.core'})
+    """
+    def __getattr__(name: str):
+        try:
+            module_name = attributes[name]
+        except KeyError:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}") from None
+        module = importlib.import_module(module_name, package)
+        value = module if module_name.lstrip('.') == name else getattr(module, name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list:
+        return sorted(set(namespace) | set(attributes))
+
+    return __getattr__, __dir__
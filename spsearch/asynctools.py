@@ -0,0 +1,80 @@
+import asyncio
+from collections import deque
+from typing import Any, AsyncGenerator, Awaitable, Callable, Iterable, Tuple, TypeVar, Union
+
+T = TypeVar('T')
+
+
+async def bounded_as_completed(func: Callable[[T], Awaitable], items: Iterable[T], concurrency: int = 10
+                               ) -> AsyncGenerator[Tuple[T, Union[Any, Exception]], None]:
+    """Runs `func` for each item with at most `concurrency` calls in flight,
+    and yields `(item, result)` in the order of completion.
+
+    Items are pulled from `items` only when there is room, so a long (or endless) iterable is fine.
+    An exception raised by `func` is yielded as the result instead of stopping the others.
+    Calls still in flight are cancelled when the generator is closed.
+    """
+    if concurrency < 1:
+        raise ValueError('concurrency must be 1 or greater.')
+    items = iter(items)
+    pending = {}
+
+    def fill():
+        for item in items:
+            pending[asyncio.ensure_future(func(item))] = item
+            if len(pending) >= concurrency:
+                return
+
+    fill()
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            completed = []
+            for task in done:
+                item = pending.pop(task)
+                try:
+                    completed.append((item, task.result()))
+                except Exception as e:
+                    completed.append((item, e))
+            # Keep the calls in flight while the caller handles the results
+            fill()
+            for item_and_result in completed:
+                yield item_and_result
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def bounded_map(func: Callable[[T], Awaitable], items: Iterable[T], concurrency: int = 10
+                      ) -> AsyncGenerator[Tuple[T, Union[Any, Exception]], None]:
+    """Same as `bounded_as_completed`, but yields `(item, result)` in the order of `items`.
+
+    A result which completes early is held until the ones before it are yielded,
+    so at most `concurrency` results are in flight or held at once.
+    """
+    if concurrency < 1:
+        raise ValueError('concurrency must be 1 or greater.')
+    items = iter(items)
+    pending = deque()
+
+    def fill():
+        for item in items:
+            pending.append((item, asyncio.ensure_future(func(item))))
+            if len(pending) >= concurrency:
+                return
+
+    fill()
+    try:
+        while pending:
+            item, task = pending[0]
+            await asyncio.wait((task,))
+            pending.popleft()
+            try:
+                result = task.result()
+            except Exception as e:
+                result = e
+            fill()
+            yield item, result
+    finally:
+        for _, task in pending:
+            task.cancel()
@@ -0,0 +1,127 @@
+import json
+import sqlite3
+import time
+from os import PathLike
+from pathlib import Path
+from typing import Any, Mapping, Optional, Union
+
+
+class ResponseCache:
+    """Persistent cache of decoded API responses backed by SQLite.
+
+    Entries are keyed by a string (e.g. endpoint plus query) and stored as JSON.
+
+    Parameters
+    ----------
+    path: str or PathLike, default ':memory:'
+        SQLite database file. ':memory:' keeps the cache in memory only.
+    ttl: float or None, default 604800 (a week)
+        Seconds an entry stays fresh. None never expires.
+    ttls: Mapping of str to float or None
+        Per-endpoint TTL which overrides `ttl`. The longest key which is a prefix of the entry key is used.
+        e.g. {'/api/v3/species/category/': 86400, '/api/v3/version': 3600}
+    max_entries: int or None, default 100000
+        The least recently used entries are evicted beyond this size. None is unbounded.
+    offline: bool, default False
+        Read-only mode. Nothing is written, and expired entries are still served
+        as there is no other source of the data. The database at `path` is opened read-only,
+        so it has to exist.
+    """
+    def __init__(self, path: Union[str, PathLike] = ':memory:', *, ttl: Optional[float] = 604800,
+                 ttls: Mapping[str, Optional[float]] = None, max_entries: Optional[int] = 100000,
+                 offline: bool = False):
+        self.path = str(path)
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.max_entries = max_entries
+        self.offline = offline
+
+        if offline:
+            # Open read-only, so that neither a missing file nor the table is created
+            uri = 'file::memory:' if self.path == ':memory:' else Path(self.path).resolve().as_uri()
+            self._db = sqlite3.connect(f'{uri}?mode=ro', uri=True)
+            self._empty = self._db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'responses'").fetchone() is None
+        else:
+            self._empty = False
+            self._db = sqlite3.connect(self.path)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('''
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL,
+                    accessed_at REAL NOT NULL
+                )
+            ''')
+            self._db.execute('CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)')
+            self._db.commit()
+        self._count = 0 if self._empty else self._db.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def ttl_for(self, key: str) -> Optional[float]:
+        """Returns the TTL applied to `key`."""
+        prefixes = [prefix for prefix in self.ttls if key.startswith(prefix)]
+        if prefixes:
+            return self.ttls[max(prefixes, key=len)]
+        return self.ttl
+
+    def get(self, key: str) -> Any:
+        """Returns the cached value for `key`, or None if it is missing or expired."""
+        if self._empty:
+            return None
+        row = self._db.execute('SELECT value, expires_at FROM responses WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        now = time.time()
+        if not self.offline:
+            if expires_at is not None and expires_at <= now:
+                return None
+            self._db.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+            self._db.commit()
+        return json.loads(value)
+
+    def set(self, key: str, value: Any):
+        """Stores `value` for `key`. Does nothing in offline mode."""
+        if self.offline:
+            return
+        now = time.time()
+        ttl = self.ttl_for(key)
+        expires_at = None if ttl is None else now + ttl
+        exists = self._db.execute('SELECT 1 FROM responses WHERE key = ?', (key,)).fetchone()
+        self._db.execute('REPLACE INTO responses (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+                         (key, json.dumps(value, separators=(',', ':')), expires_at, now))
+        if not exists:
+            self._count += 1
+        if self.max_entries is not None and self._count > self.max_entries:
+            self._db.execute('DELETE FROM responses WHERE key IN '
+                             '(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)',
+                             (self._count - self.max_entries,))
+            self._count = self.max_entries
+        self._db.commit()
+
+    def purge_expired(self) -> int:
+        """Deletes expired entries and returns how many were deleted."""
+        if self.offline:
+            return 0
+        deleted = self._db.execute('DELETE FROM responses WHERE expires_at <= ?', (time.time(),)).rowcount
+        self._db.commit()
+        self._count -= deleted
+        return deleted
+
+    def clear(self):
+        """Deletes all the entries."""
+        if self.offline:
+            return
+        self._db.execute('DELETE FROM responses')
+        self._db.commit()
+        self._count = 0
+
+    def close(self):
+        self._db.close()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, key: str):
+        return self.get(key) is not None
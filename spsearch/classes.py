@@ -1,39 +1,82 @@
-from collections.abc import Mapping, MutableSequence
+from collections.abc import ItemsView, Mapping, MutableSequence, ValuesView
 
 
 class AttrObj:
+    """Base of `AttrDict` and `AttrSeq`, which are dicts and lists of decoded JSON.
+
+    Nested dicts and lists are wrapped on their first access, and the wrapper replaces the raw
+    container in place. The first access copies one level of the container (as `dict()` or `list()`),
+    and accessing it again costs the same whatever the size of the payload.
+    The containers given to the constructors are copied the same way and never modified.
+    """
+    __slots__ = ()
+
     def __getattr__(self, item):
+        # Keep the internals (and pickle/copy protocols) away from the lookup of keys
+        if item.startswith('_'):
+            raise AttributeError(item)
         if isinstance(self, Mapping):
-            return AttrDict.__build(self[item])
+            return self[item]
         else:
             raise AttributeError(f"{type(self)}.{item} is not Mapping")
 
     def __getitem__(self, key):
-        returning = super().__getitem__(key)
-        if isinstance(returning, Mapping):
-            return AttrDict.__build(returning)
-        elif isinstance(returning, MutableSequence):
-            return AttrSeq.__build(returning)
-        else:
-            return returning
-
-    @classmethod
-    def __build(cls, obj):
-        if isinstance(obj, Mapping):
-            return AttrDict(obj)
-        elif isinstance(obj, MutableSequence):
-            return AttrSeq(cls.__build(item) for item in obj)
-        else:
-            return obj
+        if isinstance(key, slice):
+            return AttrSeq(super().__getitem__(key))
+        value = super().__getitem__(key)
+        view = _wrap(value)
+        if view is not value:
+            super().__setitem__(key, view)
+        return view
+
+    def pop(self, *args):
+        return _wrap(super().pop(*args))
+
+
+def _wrap(value):
+    """Wraps a dict or list which is not wrapped yet."""
+    if isinstance(value, AttrObj) or not isinstance(value, (Mapping, MutableSequence)):
+        return value
+    return AttrDict(value) if isinstance(value, Mapping) else AttrSeq(value)
 
 
 class AttrDict(AttrObj, dict):
-    # def __str__(self):
-    #     return "{" + ", ".join(f"{k}, {v}" for k, v in self.items()) + "}"
-    pass
+    """Dict which also accepts attribute access, e.g. `d.key` for `d['key']`."""
+    __slots__ = ()
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def popitem(self):
+        key, value = super().popitem()
+        return key, _wrap(value)
+
+    def items(self):
+        return ItemsView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def copy(self) -> 'AttrDict':
+        return AttrDict(self)
 
 
 class AttrSeq(AttrObj, list):
-    # def __str__(self):
-    #     return str([str(i) for i in self])
-    pass
+    """List whose dict items are accessible as `AttrDict`."""
+    __slots__ = ()
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __reversed__(self):
+        for i in reversed(range(len(self))):
+            yield self[i]
+
+    def copy(self) -> 'AttrSeq':
+        return AttrSeq(self)
@@ -1 +1,4 @@
-from . import classic, cypher
+from .._lazy import lazy
+
+__all__ = ['classic', 'cypher']
+__getattr__, __dir__ = lazy(__name__, globals(), {'classic': '.classic', 'cypher': '.cypher'})
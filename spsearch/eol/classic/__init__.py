@@ -1 +1,8 @@
-from .core import search, pages
+from typing import TYPE_CHECKING
+from ..._lazy import lazy
+
+if TYPE_CHECKING:
+    from .core import search, iter_search, search_many, pages, pages_many
+
+__all__ = ['search', 'iter_search', 'search_many', 'pages', 'pages_many']
+__getattr__, __dir__ = lazy(__name__, globals(), {name: '.core' for name in __all__})
@@ -1,15 +1,99 @@
 import aiohttp
+from contextlib import asynccontextmanager
+from spsearch.asynctools import bounded_as_completed, bounded_map
 from spsearch.classes import AttrSeq, AttrDict
+from spsearch.ratelimit import rate_limiter
 from yarl import URL
-from typing import Union, List
-from itertools import chain
+from typing import Any, AsyncGenerator, Dict, Iterable, Optional, Tuple, Union, List
 from copy import deepcopy
+from inspect import Parameter, signature
 
 base_url = URL('https://eol.org/')
+rate_limiter.setdefault(base_url.host, rate=2)
 
 
-async def search(q: str =None, limit: int =50, *, exact: bool =None, filter_by_taxon_concept_id: int =None,
-                 filter_by_hierarchy_entry_id: int =None, filter_by_string: int =None, cache_ttl: int =None) -> AttrSeq:
+def _search_url(q: str =None, *, exact: bool =None, filter_by_taxon_concept_id: int =None,
+                filter_by_hierarchy_entry_id: int =None, filter_by_string: int =None, cache_ttl: int =None) -> URL:
+    kwargs = deepcopy(locals())
+    url = URL(base_url.with_path('/api/search/1.0.json'))
+
+    for k in [k for k in kwargs]:
+        if kwargs[k] is None:
+            del kwargs[k]
+        elif not isinstance(kwargs[k], str):
+            kwargs[k] = str(kwargs[k]).lower()
+    return url.with_query(**kwargs)
+
+
+async def _get(session: aiohttp.ClientSession, url: URL) -> dict:
+    async with rate_limiter.request(session, 'GET', url) as resp:
+        assert resp.status == 200, f"{resp.status}: {resp.reason}"
+        return await resp.json()
+
+
+@asynccontextmanager
+async def _session(session: aiohttp.ClientSession =None) -> AsyncGenerator[aiohttp.ClientSession, None]:
+    """Uses `session`, or a new one closed at the end."""
+    if session is not None:
+        yield session
+    else:
+        async with aiohttp.ClientSession() as session:
+            yield session
+
+
+async def _search_results(url: URL, limit: Optional[int], concurrency: int,
+                          session: aiohttp.ClientSession =None) -> AsyncGenerator[dict, None]:
+    """Yields the raw results in order. The first page tells how many pages there are to fetch concurrently."""
+    async with _session(session) as session:
+        first = await _get(session, url.update_query(page=1))
+        total = first['totalResults'] if limit is None else min(limit, first['totalResults'])
+        per_page = first['itemsPerPage'] or len(first['results'])
+        for result in first['results'][:total]:
+            yield result
+        count = min(total, len(first['results']))
+        if count >= total or not per_page:
+            return
+
+        last_page = -(-total // per_page)
+        pages = bounded_map(lambda page: _get(session, url.update_query(page=page)), range(2, last_page + 1),
+                            concurrency)
+        try:
+            async for _, data in pages:
+                if isinstance(data, Exception):
+                    raise data
+                for result in data['results'][:total - count]:
+                    yield result
+                count += len(data['results'])
+                if count >= total or not data['results']:
+                    return
+        finally:
+            await pages.aclose()
+
+
+async def iter_search(q: str =None, limit: Optional[int] =50, *, concurrency: int =4,
+                      session: aiohttp.ClientSession =None, **kwargs) -> AsyncGenerator[AttrDict, None]:
+    """Yields the results of `search` in order as the pages arrive.
+
+    After the first page, the rest of the pages up to `limit` are fetched `concurrency` at a time.
+    `limit=None` gets all the results. Give `session` to share it with other requests.
+    The other parameters are the same as `search`.
+
+    Example
+    =======
+    async for result in iter_search('Lutra', limit=None):
+        print(result.id, result.title)
+    """
+    results = _search_results(_search_url(q, **kwargs), limit, concurrency, session)
+    try:
+        async for result in results:
+            yield AttrDict(result)
+    finally:
+        await results.aclose()
+
+
+async def search(q: str =None, limit: Optional[int] =50, *, exact: bool =None, filter_by_taxon_concept_id: int =None,
+                 filter_by_hierarchy_entry_id: int =None, filter_by_string: int =None, cache_ttl: int =None,
+                 concurrency: int =4, session: aiohttp.ClientSession =None) -> AttrSeq:
     """Search pages.
 
     Parameters
@@ -17,7 +101,7 @@ async def search(q: str =None, limit: int =50, *, exact: bool =None, filter_by_t
     q
         the query string
     limit
-        the number of item you want to get
+        the number of item you want to get. None gets all of them.
     exact
         will find taxon pages if the title or any synonym or common name exactly matches the search term
     filter_by_taxon_concept_id
@@ -29,6 +113,10 @@ async def search(q: str =None, limit: int =50, *, exact: bool =None, filter_by_t
         as the taxonomic group against which to filter search results
     cache_ttl
         the number of seconds you wish to have the response cached
+    concurrency
+        the number of pages of results fetched at once
+    session
+        session to use instead of a new one
 
     Returns
     -------
@@ -42,27 +130,37 @@ async def search(q: str =None, limit: int =50, *, exact: bool =None, filter_by_t
         },
         ... ]
     """
-    kwargs = deepcopy(locals())
-    url = URL(base_url.with_path('/api/search/1.0.json'))
+    url = _search_url(q, exact=exact, filter_by_taxon_concept_id=filter_by_taxon_concept_id,
+                      filter_by_hierarchy_entry_id=filter_by_hierarchy_entry_id, filter_by_string=filter_by_string,
+                      cache_ttl=cache_ttl)
+    return AttrSeq([result async for result in _search_results(url, limit, concurrency, session)])
 
-    for k in [k for k in kwargs]:
-        if kwargs[k] is None or k == 'limit':
-            del kwargs[k]
-        elif not isinstance(kwargs[k], str):
-            kwargs[k] = str(kwargs[k]).lower()
-    url = url.with_query(**kwargs)
 
-    page = 1
-    result = []
-    while limit > 0:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                data = await resp.json()
-                result.append(data['results'])
-                if data['startIndex'] + data['itemsPerPage'] >= data['totalResults']:
-                    return AttrSeq(chain.from_iterable(result))
-                limit -= data['itemsPerPage']
-                page += 1
+async def search_many(queries: Iterable[str], limit: Optional[int] =50, *, concurrency: int =4,
+                      **kwargs) -> AsyncGenerator[Tuple[str, Union[AttrSeq, Exception]], None]:
+    """Runs `search` for many queries over one session, keeping `concurrency` searches in flight.
+
+    The pages of each search are fetched one at a time, as the searches are already concurrent.
+    A failure of one search is yielded in place of its results and does not stop the others.
+
+    Yields
+    ------
+    (query, AttrSeq or Exception)
+        in the order of completion.
+
+    Example
+    =======
+    async for q, results in search_many(['Lutra lutra', 'Aonyx cinereus']):
+        print(q, len(results))
+    """
+    async with aiohttp.ClientSession() as session:
+        searches = bounded_as_completed(
+            lambda q: search(q, limit, concurrency=1, session=session, **kwargs), queries, concurrency)
+        try:
+            async for q, results in searches:
+                yield q, results
+        finally:
+            await searches.aclose()
 
 
 async def pages(id: Union[str, int], *, batch: bool =False,
@@ -187,19 +285,11 @@ async def pages(id: Union[str, int], *, batch: bool =False,
         }
     """
     kwargs = deepcopy(locals())
-    url = base_url.with_path(f'/api/pages/1.0/{id}.json')
-
-    for k in [k for k in kwargs]:
-        if kwargs[k] is None or k in ['limit', 'id']:
-            del kwargs[k]
-        elif k in ['subjects', 'licenses']:
-            kwargs[k] = '|'.join(kwargs[k])
-        elif not isinstance(kwargs[k], str):
-            kwargs[k] = str(kwargs[k]).lower()
-    url = url.with_query(**kwargs)
+    del kwargs['id']
+    url = base_url.with_path(f'/api/pages/1.0/{id}.json').with_query(**_pages_query(kwargs))
 
     async with aiohttp.ClientSession() as session:
-        async with session.get(url) as resp:
+        async with rate_limiter.request(session, 'GET', url) as resp:
             data = await resp.json()
             # data returns in these styles:
             # Style 1: data == { "46559121": {...} }
@@ -208,6 +298,89 @@ async def pages(id: Union[str, int], *, batch: bool =False,
                 return AttrDict(data[k])
 
 
+def _pages_query(kwargs: Dict[str, Any]) -> Dict[str, str]:
+    """Makes the query of `pages` from its keyword arguments. Those not given take the defaults of `pages`."""
+    options = {name: parameter.default for name, parameter in signature(pages).parameters.items()
+               if parameter.kind is Parameter.KEYWORD_ONLY}
+    unknown = set(kwargs) - set(options)
+    if unknown:
+        raise TypeError(f"Unexpected keyword arguments: {', '.join(sorted(unknown))}")
+    options.update(kwargs)
+
+    for k in [k for k in options]:
+        if options[k] is None:
+            del options[k]
+        elif k in ['subjects', 'licenses']:
+            options[k] = '|'.join(options[k])
+        elif not isinstance(options[k], str):
+            options[k] = str(options[k]).lower()
+    return options
+
+
+def _split_pages(data: Union[dict, list], ids: List[str]) -> Dict[str, dict]:
+    """Splits a batched response into the page of each ID."""
+    found = {}
+    # A batch comes as a list of the pages, or as one object of them
+    for item in data if isinstance(data, list) else [data]:
+        for k, page in item.items():
+            if k in ids:
+                # Style 1
+                found[k] = page
+            elif isinstance(page, dict) and str(page.get('identifier')) in ids:
+                # Style 2
+                found[str(page['identifier'])] = page
+            elif len(ids) == 1 and isinstance(page, dict):
+                found.setdefault(ids[0], page)
+    return found
+
+
+async def pages_many(ids: Iterable[Union[str, int]], chunk: int =100, concurrency: int =4,
+                     **kwargs) -> Dict[Union[str, int], Optional[AttrDict]]:
+    """Gets many pages with one batched request per `chunk` IDs, running `concurrency` requests at once.
+
+    Parameters
+    ----------
+    ids
+        EOL page identifiers
+    chunk
+        the number of IDs in a request
+    concurrency
+        the number of requests in flight at once
+    kwargs
+        the same as `pages`, except `batch`
+
+    Returns
+    -------
+    dict of each ID to its page as `pages` returns it, or to None if it is not in the response
+
+    Example
+    =======
+    result = await pages_many([46559121, 46559130], images_per_page=0, texts_per_page=0, synonyms=True)
+    """
+    ids = list(ids)
+    keys = list(dict.fromkeys(str(id) for id in ids))
+    kwargs['batch'] = True
+    query = _pages_query(kwargs)
+    url = base_url.with_path('/api/pages/1.0.json')
+
+    async with aiohttp.ClientSession() as session:
+        async def get(chunk_ids: List[str]) -> Dict[str, dict]:
+            data = await _get(session, url.with_query(id=','.join(chunk_ids), **query))
+            return _split_pages(data, chunk_ids)
+
+        found = {}
+        requests = bounded_as_completed(get, [keys[i:i + chunk] for i in range(0, len(keys), chunk)], concurrency)
+        try:
+            async for _, result in requests:
+                if isinstance(result, Exception):
+                    raise result
+                found.update(result)
+        finally:
+            await requests.aclose()
+
+    return {id: AttrDict(found[str(id)]) if str(id) in found else None for id in ids}
+
+
 if __name__ == '__main__':
     import asyncio
     from pprint import pprint
@@ -1,3 +1,23 @@
-from .core import CypherExecutor
-from .page import Page
-from .trait import Trait, TraitProxy, Resource, Predicate, Literal, Object, Units
+from typing import TYPE_CHECKING
+from ..._lazy import lazy
+
+if TYPE_CHECKING:
+    from .core import CypherExecutor
+    from .cache import QueryCache
+    from .result import ColumnarResult
+    from .aggregate import TraitAggregation
+    from .page import Page
+    from .traitset import TraitSet
+    from .trait import Trait, TraitProxy, Resource, Predicate, Literal, Object, Units
+
+__all__ = ['CypherExecutor', 'QueryCache', 'ColumnarResult', 'TraitAggregation', 'Page',
+           'TraitSet', 'Trait', 'TraitProxy', 'Resource', 'Predicate', 'Literal', 'Object', 'Units']
+__getattr__, __dir__ = lazy(__name__, globals(), {
+    'CypherExecutor': '.core',
+    'QueryCache': '.cache',
+    'ColumnarResult': '.result',
+    'TraitAggregation': '.aggregate',
+    'Page': '.page',
+    'TraitSet': '.traitset',
+    **{name: '.trait' for name in ['Trait', 'TraitProxy', 'Resource', 'Predicate', 'Literal', 'Object', 'Units']},
+})
@@ -0,0 +1,153 @@
+import json
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple, Union
+from .result import ColumnarResult
+from .trait import TraitProxy, _category_filter
+
+if TYPE_CHECKING:
+    from .core import CypherExecutor
+    from .page import Page
+
+# Group -> columns it returns as (expression, alias)
+groups = {
+    'predicate': (('pred.uri', 'predicate_uri'), ('pred.name', 'predicate')),
+    'page': (('p.page_id', 'page_id'), ('p.canonical', 'canonical')),
+    'units': (('units.uri', 'units_uri'), ('units.name', 'units')),
+}
+
+# Shorthands of the values to aggregate
+values = {
+    'measurement': 'toFloat(t.normal_measurement)',
+    'object': 'obj.name',
+    'literal': 't.literal',
+    'units': 'units.name',
+}
+
+functions = ('count', 'avg', 'min', 'max', 'sum', 'collect')
+
+
+class TraitAggregation:
+    """Builds a Cypher query which aggregates the traits on the server, so that only a row per group is sent back.
+
+    Example
+    =======
+    aggregation = TraitAggregation(by='predicate', pages=[46559130, 'Lutra lutra']).count().avg().min().max()
+    summary = await aggregation.execute(executor)
+    for row in summary:
+        print(row.predicate, row.count, row.avg)
+
+    or `executor.aggregate_traits(...)` and `page.aggregate_traits(...)` for the common cases.
+
+    Parameters
+    ----------
+    by: str or Iterable of str, default 'predicate'
+        Groups of the traits: 'predicate', 'page' and/or 'units'.
+    pages: Iterable of Page, int or str, optional
+        Pages, page IDs or canonical names whose traits are aggregated. Defaults to all the pages.
+    category: str or TraitProxy, optional
+        Only the traits of this category (or predicate), as `Page.get_traits` does.
+    """
+    def __init__(self, by: Union[str, Iterable[str]] = 'predicate', *,
+                 pages: Iterable[Union['Page', int, str]] = None, category: Union[str, TraitProxy] = None):
+        self.by = (by,) if isinstance(by, str) else tuple(by)
+        for group in self.by:
+            if group not in groups:
+                raise ValueError(f'by has to be some of {tuple(groups)}, not {group!r}.')
+        self.page_ids: Optional[List[int]] = None
+        self.names: Optional[List[str]] = None
+        if pages is not None:
+            self.page_ids, self.names = [], []
+            for page in pages:
+                if isinstance(page, str):
+                    self.names.append(page)
+                elif hasattr(page, 'page_id'):
+                    if page.page_id:
+                        self.page_ids.append(int(page.page_id))
+                    else:
+                        self.names.append(page.canonical)
+                else:
+                    self.page_ids.append(int(page))
+        self.category = category
+        self.aggregates: List[Tuple[str, str]] = []
+
+    def aggregate(self, function: str, value: str = 'measurement', alias: str = None) -> 'TraitAggregation':
+        """Adds a column of `function` ('count', 'avg', 'min', 'max', 'sum' or 'collect') of `value`.
+
+        `value` is 'measurement', 'object', 'literal', 'units' or a Cypher expression over
+        the trait `t`, its predicate `pred`, object `obj`, units `units` and page `p`.
+        `alias` (the name of the column) defaults to `function`, and must differ from the other columns.
+        """
+        function = function.lower()
+        if function not in functions:
+            raise ValueError(f'function has to be one of {functions}, not {function!r}.')
+        expression = values.get(value, value)
+        if function == 'collect':
+            expression = f'COLLECT(DISTINCT {expression})'
+        else:
+            expression = f'{function.upper()}({expression})'
+        return self._add(expression, alias or function)
+
+    def count(self, alias: str = 'count') -> 'TraitAggregation':
+        """Adds the number of the traits."""
+        return self._add('COUNT(t)', alias)
+
+    def _add(self, expression: str, alias: str) -> 'TraitAggregation':
+        # Cypher rejects a column name returned twice, e.g. avg of two values without their own aliases
+        used = [a for group in self.by for _, a in groups[group]] + [a for _, a in self.aggregates]
+        if alias in used:
+            raise ValueError(f'Column {alias!r} is already returned. Give another alias.')
+        self.aggregates.append((expression, alias))
+        return self
+
+    def avg(self, value: str = 'measurement', alias: str = 'avg') -> 'TraitAggregation':
+        return self.aggregate('avg', value, alias)
+
+    def min(self, value: str = 'measurement', alias: str = 'min') -> 'TraitAggregation':
+        return self.aggregate('min', value, alias)
+
+    def max(self, value: str = 'measurement', alias: str = 'max') -> 'TraitAggregation':
+        return self.aggregate('max', value, alias)
+
+    def sum(self, value: str = 'measurement', alias: str = 'sum') -> 'TraitAggregation':
+        return self.aggregate('sum', value, alias)
+
+    def collect(self, value: str = 'object', alias: str = 'values') -> 'TraitAggregation':
+        """Adds the distinct values, e.g. of a categorical trait."""
+        return self.aggregate('collect', value, alias)
+
+    def query(self) -> str:
+        if not self.aggregates:
+            raise ValueError('Add at least one aggregate, e.g. count().')
+        lines = []
+        if self.page_ids is None:
+            lines.append('MATCH (p:Page)')
+        else:
+            conditions = []
+            if self.page_ids:
+                conditions.append(f'p.page_id IN {json.dumps(self.page_ids)}')
+            if self.names:
+                conditions.append(f'p.canonical IN {json.dumps(self.names)}')
+            lines.append(f"MATCH (p:Page) WHERE {' OR '.join(conditions) or 'false'}")
+        lines.append('MATCH (p)-[:trait]->(t:Trait), (t)-[:predicate]->(pred:Term)')
+        category = _category_filter(self.category)
+        if category:
+            lines.append(category)
+        used = ' '.join(self.by) + ' ' + ' '.join(expression for expression, _ in self.aggregates)
+        if 'obj.' in used:
+            lines.append('OPTIONAL MATCH (t)-[:object_term]->(obj:Term)')
+        if 'units' in used:
+            lines.append('OPTIONAL MATCH (t)-[:normal_units_term]->(units:Term)')
+
+        keys = [column for group in self.by for column in groups[group]]
+        lines.append('RETURN ' + ', '.join(f'{expression} AS {alias}' for expression, alias in keys + self.aggregates))
+        if keys:
+            # A stable order, as the result is paginated
+            lines.append('ORDER BY ' + ', '.join(alias for _, alias in keys))
+        return '\n'.join(lines)
+
+    async def execute(self, executor: 'CypherExecutor', chunk: int = 1000, concurrency: int = 4) -> ColumnarResult:
+        """Executes the query and returns a row per group.
+
+        The server redoes the whole aggregation for each page, so the first page is fetched alone,
+        and the rest (`concurrency` at a time) only if there are more than `chunk` groups.
+        """
+        return await executor.execute_columnar(self.query(), items=None, chunk=chunk, concurrency=concurrency)
@@ -0,0 +1,98 @@
+import re
+from collections import OrderedDict
+from typing import Any, Optional
+from ...cache import ResponseCache
+
+# Runs of whitespace outside of the string literals
+_whitespace = re.compile(r'''("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')|\s+''')
+
+
+class QueryCache:
+    """Cache of Cypher results keyed by the query text, given to `CypherExecutor(token, cache=...)`.
+
+    Results are kept in memory up to `maxsize` queries, evicting the least recently used one,
+    and optionally in a `ResponseCache` on disk, which expires them after its TTL.
+    Queries which differ only in indentation or line breaks share an entry.
+    Each page of a paginated query is an entry of its own, as its text includes `SKIP` and `LIMIT`.
+
+    The results in memory are shared by the callers, so do not modify them.
+
+    Example
+    =======
+    cache = QueryCache(store=ResponseCache('eol.sqlite', ttl=30 * 86400))
+    executor = CypherExecutor(token, cache=cache)
+
+    Parameters
+    ----------
+    maxsize: int, default 1024
+        Number of results kept in memory.
+    store: ResponseCache, optional
+        Persistent cache behind the one in memory.
+
+    Attributes
+    ----------
+    hits: int
+        Number of queries answered from the cache, in memory or on disk.
+    misses: int
+        Number of queries which had to be executed.
+    """
+    def __init__(self, maxsize: int = 1024, *, store: ResponseCache = None):
+        if maxsize < 1:
+            raise ValueError('maxsize must be 1 or greater.')
+        self.maxsize = maxsize
+        self.store = store
+        self._results: 'OrderedDict[str, Any]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.
+
+    @staticmethod
+    def key(query: str) -> str:
+        """Normalizes the whitespace of `query`, leaving the string literals as they are."""
+        return 'cypher:' + _whitespace.sub(lambda m: m.group(1) or ' ', query).strip()
+
+    def get(self, query: str) -> Optional[Any]:
+        """Returns the cached result of `query`, or None. Counts a hit or a miss."""
+        key = self.key(query)
+        try:
+            result = self._results[key]
+        except KeyError:
+            result = self.store.get(key) if self.store is not None else None
+            if result is None:
+                self.misses += 1
+                return None
+            self._remember(key, result)
+        else:
+            self._results.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def set(self, query: str, result: Any):
+        key = self.key(query)
+        self._remember(key, result)
+        if self.store is not None:
+            self.store.set(key, result)
+
+    def _remember(self, key: str, result: Any):
+        self._results[key] = result
+        self._results.move_to_end(key)
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+    def clear(self):
+        """Forgets the results in memory and on disk, and resets the statistics."""
+        self._results.clear()
+        if self.store is not None:
+            self.store.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._results)
+
+    def __contains__(self, query: str):
+        return self.key(query) in self._results
@@ -1,45 +1,165 @@
 import aiohttp
 import typing
 import itertools
-from spsearch.classes import AttrDict
+import warnings
+from contextlib import asynccontextmanager
+from spsearch.asynctools import bounded_map
+from spsearch.classes import AttrDict, AttrSeq
+from spsearch.eol.cypher.aggregate import TraitAggregation
+from spsearch.eol.cypher.cache import QueryCache
+from spsearch.eol.cypher.result import ColumnarResult
+from spsearch.ratelimit import RateLimiter, rate_limiter
 import io
-import asyncio
 
 endpoint = "https://eol.org/service/cypher"
+rate_limiter.setdefault('eol.org', rate=2)
+
+
+class UnparsableDataException(Exception):
+    """The pages of a result cannot be merged into one."""
 
 
 class CypherExecutor:
-    def __init__(self, token: typing.Union[str, typing.TextIO]):
+    """
+    Parameters
+    ----------
+    token: str or file-like
+        EOL API token.
+    rate_limiter: RateLimiter, optional
+        Defaults to the one shared by all the providers (`spsearch.ratelimit.rate_limiter`).
+        It paces the concurrent pages of `execute` and `execute_iter`.
+    cache: QueryCache, optional
+        Cache of the results, which answers a query (or a page of it) executed before without a request.
+
+    Example
+    =======
+    Each `execute` uses a session of its own for its pages.
+    Use the executor as a context manager to share one session across the queries:
+
+    async with CypherExecutor(token) as executor:
+        async for row in executor.execute_iter(query):
+            ...
+    """
+    def __init__(self, token: typing.Union[str, typing.TextIO], rate_limiter: RateLimiter = rate_limiter,
+                 cache: QueryCache = None):
         if isinstance(token, str):
             self.token = token
         elif isinstance(token, typing.TextIO) or isinstance(token, io.TextIOBase):
             self.token = token.read()
         else:
             raise TypeError("token has to be str or file-like.")
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self._session = None
+
+    async def close(self):
+        """Closes the session shared while the executor is used as a context manager."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> 'CypherExecutor':
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
 
-    async def _execute_query(self, query: str) -> dict:
+    @asynccontextmanager
+    async def _session_scope(self) -> typing.AsyncGenerator[aiohttp.ClientSession, None]:
+        if self._session is not None and not self._session.closed:
+            yield self._session
+        else:
+            async with aiohttp.ClientSession() as session:
+                yield session
+
+    async def _execute_query(self, query: str, session: aiohttp.ClientSession = None) -> dict:
+        if self.cache is not None:
+            result = self.cache.get(query)
+            if result is not None:
+                return result
+        if session is None:
+            async with self._session_scope() as session:
+                result = await self._request(query, session)
+        else:
+            result = await self._request(query, session)
+        if self.cache is not None:
+            self.cache.set(query, result)
+        return result
+
+    async def _request(self, query: str, session: aiohttp.ClientSession) -> dict:
         from urllib.parse import quote
         params = {"query": quote(query)}
         headers = {"Authorization": f"JWT {self.token}"}
-        async with aiohttp.ClientSession() as session:
-            async with session.get(endpoint, headers=headers, params=params) as response:
-                assert response.status == 200, f"{response.status}: {response.reason}"
-                return await response.json()
-
-    async def _paginate(self, query: str, items: int, chunk: int) -> typing.AsyncGenerator[dict, None]:
-        count = 0
-        while count * chunk < items:
-            pagenated_query = query + f'\nSKIP {count*chunk} LIMIT {chunk if items >= chunk else items}'
-            # print(query)
-            result = await self._execute_query(pagenated_query)
-            yield result
-            count += 1
-
-    async def execute(self, query: str, items: int =100, chunk: int =100, interval: int =1) -> AttrDict:
+        async with self.rate_limiter.request(session, 'GET', endpoint, headers=headers, params=params) as response:
+            assert response.status == 200, f"{response.status}: {response.reason}"
+            return await response.json()
+
+    async def _paginate(self, query: str, items: typing.Optional[int], chunk: int, concurrency: int
+                        ) -> typing.AsyncGenerator[dict, None]:
+        """Yields the results of `SKIP`/`LIMIT` pages in order.
+        The first page is fetched alone, and only if it comes back full are the rest fetched up to
+        `concurrency` pages at once. With `items=None`, pages are fetched until one comes back short.
+        """
+        def pages():
+            for skip in itertools.count(chunk, chunk):
+                if items is not None and skip >= items:
+                    return
+                yield skip, chunk if items is None else min(chunk, items - skip)
+
+        def page_query(skip: int, limit: int) -> str:
+            return query + f'\nSKIP {skip} LIMIT {limit}'
+
+        if items is not None and items <= 0:
+            return
+        async with self._session_scope() as session:
+            limit = chunk if items is None else min(chunk, items)
+            first = await self._execute_query(page_query(0, limit), session)
+            yield first
+            # A short page is the last one, so a result within a page costs a single request
+            if len(first.get('data', ())) < limit:
+                return
+
+            results = bounded_map(lambda page: self._execute_query(page_query(*page), session), pages(), concurrency)
+            try:
+                async for (skip, limit), result in results:
+                    if isinstance(result, Exception):
+                        raise result
+                    yield result
+                    # The rest is empty. Closing `results` cancels the pages fetched ahead.
+                    if len(result.get('data', ())) < limit:
+                        return
+            finally:
+                await results.aclose()
+
+    async def execute(self, query: str, items: typing.Optional[int] = 100, chunk: int = 100,
+                      interval: float = None, concurrency: int = 4) -> AttrDict:
+        """Executes the query and merges its pages into one result.
+
+        Parameters
+        ----------
+        query: str
+            Cypher query without `SKIP` and `LIMIT`.
+        items: int or None, default 100
+            Number of rows to get. None gets all of them.
+        chunk: int, default 100
+            Rows per request.
+        interval: float, optional
+            Deprecated and ignored. Requests are paced by the rate limiter instead.
+        concurrency: int, default 4
+            Number of pages fetched at once.
+
+        Returns
+        -------
+        AttrDict of 'columns' and 'data'
+        """
+        if interval is not None:
+            warnings.warn('interval is ignored, as the requests are paced by the rate limiter. '
+                          'Use concurrency or the rate limiter to tune it.', DeprecationWarning, stacklevel=2)
         results = []
-        async for chunk in self._paginate(query, items=items, chunk=chunk):
-            results.append(chunk)
-            await asyncio.sleep(interval)
+        async for result in self._paginate(query, items=items, chunk=chunk, concurrency=concurrency):
+            results.append(result)
 
         expected_keys = ("columns", "data")
         if len(results) == 1:
@@ -52,5 +172,77 @@ class CypherExecutor:
                     'columns': results[0]['columns'],
                     'data': list(itertools.chain.from_iterable(r['data'] for r in results))
                 })
-        else:
-            raise UnparsableDataException(f"Data cannot be parsed.")
+        raise UnparsableDataException(f"Data cannot be parsed.")
+
+    async def execute_columnar(self, query: str, items: typing.Optional[int] = 100, chunk: int = 100,
+                               concurrency: int = 4) -> ColumnarResult:
+        """Same as `execute`, but decodes the pages into the columns of a `ColumnarResult`.
+
+        Example
+        =======
+        result = await executor.execute_columnar(query, items=None, chunk=1000)
+        measurements = result.to_numpy('properties(t)', 'normal_measurement')
+        """
+        result = None
+        async for page in self._paginate(query, items=items, chunk=chunk, concurrency=concurrency):
+            if 'columns' not in page or 'data' not in page:
+                raise UnparsableDataException("Data cannot be parsed.")
+            if result is None:
+                result = ColumnarResult(page['columns'])
+            elif page['columns'] != result.columns:
+                raise UnparsableDataException("Data cannot be parsed.")
+            result.extend(page['data'])
+        return result if result is not None else ColumnarResult(())
+
+    async def aggregate_traits(self, by: typing.Union[str, typing.Iterable[str]] = 'predicate',
+                               functions: typing.Iterable[str] = ('count', 'avg', 'min', 'max'),
+                               value: str = 'measurement', pages: typing.Iterable = None,
+                               category: typing.Any = None) -> ColumnarResult:
+        """Aggregates the traits on the server and returns a row per group.
+
+        Parameters
+        ----------
+        by: str or Iterable of str, default 'predicate'
+            Groups: 'predicate', 'page' and/or 'units'.
+        functions: Iterable of str, default ('count', 'avg', 'min', 'max')
+            'count' (of the traits), 'avg', 'min', 'max', 'sum' and/or 'collect' of `value`.
+        value: str, default 'measurement'
+            See `TraitAggregation.aggregate`.
+        pages: Iterable of Page, int or str, optional
+            Pages, page IDs or canonical names. Defaults to all the pages.
+        category: str or TraitProxy, optional
+
+        Returns
+        -------
+        ColumnarResult whose columns are the keys of the groups followed by `functions`.
+
+        Example
+        =======
+        summary = await executor.aggregate_traits(by=('predicate', 'units'), pages=page_ids)
+        """
+        aggregation = TraitAggregation(by, pages=pages, category=category)
+        for function in functions:
+            if function == 'count':
+                aggregation.count()
+            else:
+                aggregation.aggregate(function, value)
+        return await aggregation.execute(self)
+
+    async def execute_iter(self, query: str, items: typing.Optional[int] = None, chunk: int = 100,
+                           concurrency: int = 4) -> typing.AsyncGenerator[AttrSeq, None]:
+        """Yields the rows of the query as the pages arrive, without merging them.
+
+        Parameters are the same as `execute`, except that `items` defaults to None, i.e. all the rows.
+
+        Example
+        =======
+        async for row in executor.execute_iter(query, chunk=500):
+            print(row[0])
+        """
+        pages = self._paginate(query, items=items, chunk=chunk, concurrency=concurrency)
+        try:
+            async for result in pages:
+                for row in result.get('data', ()):
+                    yield AttrSeq(row)
+        finally:
+            await pages.aclose()
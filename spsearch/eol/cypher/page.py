@@ -1,10 +1,34 @@
-from typing import Union, List, TYPE_CHECKING
+from typing import Dict, Hashable, Iterable, Optional, Union, List, TYPE_CHECKING
+from weakref import WeakKeyDictionary
+import json
 import textwrap
+from ...asynctools import bounded_as_completed
 from .core import CypherExecutor
-from .trait import TraitProxy, Trait
+from .trait import TraitProxy, Trait, _category_filter
+
+if TYPE_CHECKING:
+    from .result import ColumnarResult
+
+
+def _traits_query(match: str, category: Union[str, TraitProxy, None], returns: str) -> str:
+    """Query of the traits of the pages `p` matched by `match`, which has to be a line."""
+    return textwrap.dedent(f'''
+        {match}
+        MATCH (p)-[:trait]->(t:Trait),
+              (t)-[:supplier]->(r:Resource),
+              (t)-[:predicate]->(pred:Term)
+        {_category_filter(category)}
+        OPTIONAL MATCH (t)-[:object_term]->(obj:Term)
+        OPTIONAL MATCH (t)-[:normal_units_term]->(units:Term)
+        OPTIONAL MATCH (lit:Term) WHERE lit.uri = t.literal
+        RETURN {returns}
+    ''')
 
 
 class Page:
+    # executor -> {(field, value): Page or None}, shared by from_names and from_ids
+    _resolved: 'WeakKeyDictionary[CypherExecutor, Dict[tuple, Optional[Page]]]' = WeakKeyDictionary()
+
     def __init__(self, executor: CypherExecutor =None, data: dict =None, canonical =None, page_id =None, token: str =None):
         assert executor or token, 'Either executor or token should be given'
         assert data or canonical or page_id, 'Either data, canonical or page_id has to be given'
@@ -30,8 +54,8 @@ class Page:
             MATCH (p:Page {{page_id: {id} }})
             RETURN properties(p)
         '''))
-        return cls(executor, canonical=result['data']['canonical'],
-                   page_id=result['data']['canonical'])
+        return cls(executor, canonical=result['data'][0][0]['canonical'],
+                   page_id=result['data'][0][0]['page_id'])
 
     @classmethod
     async def from_name(cls, executor: CypherExecutor, name: str) -> 'Page':
@@ -39,16 +63,94 @@ class Page:
             MATCH (p:Page {{canonical: "{name}" }})
             RETURN properties(p)
         '''))
-        print(result)
         return cls(executor, canonical=result['data'][0][0]['canonical'],
                    page_id=result['data'][0][0]['page_id'])
 
+    @classmethod
+    async def from_ids(cls, executor: CypherExecutor, ids: Iterable[Union[int, str]], chunk: int =500,
+                       concurrency: int =4) -> Dict[Union[int, str], Optional['Page']]:
+        """Resolves many page IDs with one query per `chunk` IDs.
+
+        Returns
+        -------
+        dict of each ID to its Page, or to None if there is no such page.
+        """
+        ids = list(ids)
+        resolved = await cls._resolve_many(executor, 'page_id', [int(id) for id in ids], chunk, concurrency)
+        return {id: resolved[int(id)] for id in ids}
+
+    @classmethod
+    async def from_names(cls, executor: CypherExecutor, names: Iterable[str], chunk: int =500,
+                         concurrency: int =4) -> Dict[str, Optional['Page']]:
+        """Resolves many canonical names with one query per `chunk` names.
+        A name shared by several pages resolves to the one with the smallest page ID.
+
+        Pages resolved by `from_names` and `from_ids` are cached for each executor,
+        and are not queried again until `clear_cache`. So are the misses.
+
+        Example
+        =======
+        pages = await Page.from_names(executor, ['Lutra lutra', 'Aonyx cinereus', 'No such name'])
+        missing = [name for name, page in pages.items() if page is None]
+
+        Returns
+        -------
+        dict of each name to its Page, or to None if there is no such page.
+        """
+        return await cls._resolve_many(executor, 'canonical', list(names), chunk, concurrency)
+
+    @classmethod
+    async def _resolve_many(cls, executor: CypherExecutor, field: str, values: List[Union[int, str]], chunk: int,
+                            concurrency: int) -> Dict[Union[int, str], Optional['Page']]:
+        resolved = cls._resolved.setdefault(executor, {})
+        missing = [value for value in dict.fromkeys(values) if (field, value) not in resolved]
+
+        async def execute(keys):
+            found = {}
+            query = f'UNWIND {json.dumps(keys)} AS key MATCH (p:Page {{{field}: key}}) ' \
+                    f'RETURN key, properties(p) ORDER BY key, p.page_id'
+            async for datum in executor.execute_iter(query, chunk=chunk, concurrency=1):
+                if datum[0] not in found:
+                    found[datum[0]] = cls(executor, data=datum[1])
+            for key in keys:
+                resolved[(field, key)] = found.get(key)
+
+        results = bounded_as_completed(execute, [missing[i:i + chunk] for i in range(0, len(missing), chunk)],
+                                       concurrency)
+        try:
+            async for _, result in results:
+                if isinstance(result, Exception):
+                    raise result
+        finally:
+            await results.aclose()
+        return {value: resolved[(field, value)] for value in values}
+
+    @classmethod
+    def clear_cache(cls, executor: CypherExecutor =None):
+        """Forgets the pages resolved by `from_names` and `from_ids` with `executor`, or with any executor."""
+        if executor is None:
+            cls._resolved.clear()
+        else:
+            cls._resolved.pop(executor, None)
+
     def __str__(self):
         return self.canonical
 
     def __repr__(self):
         return f'<Page canonical="{self.canonical}", page_id="{self.page_id}">'
 
+    async def aggregate_traits(self, by: Union[str, Iterable[str]] ='predicate',
+                               functions: Iterable[str] =('count', 'avg', 'min', 'max'), value: str ='measurement',
+                               category: Union[str, TraitProxy] =None) -> 'ColumnarResult':
+        """Summarizes the traits of this page on the server. See `CypherExecutor.aggregate_traits`.
+
+        Example
+        =======
+        for row in await page.aggregate_traits():
+            print(row.predicate, row.count, row.avg)
+        """
+        return await self.executor.aggregate_traits(by, functions, value, pages=[self], category=category)
+
     async def get_categories(self) -> List[TraitProxy]:
         """Gets list of available categories (or predicates)"""
         query = textwrap.dedent(f'''
@@ -59,21 +161,84 @@ class Page:
         return [TraitProxy(uri=i[0], name=i[1]) for i in result['data'][0][0]]
 
     async def get_traits(self, category: Union[str, TraitProxy] =None) -> List[Trait]:
-        where = ''
-        if category:
-            where = f'WHERE pred.name = "{category}"'\
-                    + (f' and pred.uri = "{category.uri}"' if isinstance(category, TraitProxy) else '')
-
-        query = textwrap.dedent(f'''
-            MATCH (p:Page {self._identifier})-[:trait]->(t:Trait),
-                  (t)-[:supplier]->(r:Resource),
-                  (t)-[:predicate]->(pred:Term)
-            {where}
-            OPTIONAL MATCH (t)-[:object_term]->(obj:Term)
-            OPTIONAL MATCH (t)-[:normal_units_term]->(units:Term)
-            OPTIONAL MATCH (lit:Term) WHERE lit.uri = t.literal
-            RETURN properties(p), properties(t), properties(r), properties(pred), properties(obj), properties(units), properties(lit)
-        ''')
+        query = _traits_query(f'MATCH (p:Page {self._identifier})', category,
+                              'properties(p), properties(t), properties(r), properties(pred), properties(obj), '
+                              'properties(units), properties(lit)')
         result = await self.executor.execute(query)
         return [Trait(self.executor, Page(self.executor, data=datum[0]), datum[1], datum[2], datum[3],
                       datum[4], datum[5], datum[6]) for datum in result['data']]
+
+    @classmethod
+    async def get_traits_many(cls, executor: CypherExecutor, pages: Iterable[Union['Page', int, str]],
+                              category: Union[str, TraitProxy] =None, chunk: int =50,
+                              rows_per_request: int =1000, concurrency: int =4) -> Dict[Hashable, List[Trait]]:
+        """Gets the traits of many pages with one query per `chunk` pages.
+
+        Parameters
+        ----------
+        executor: CypherExecutor
+        pages: Iterable of Page, int or str
+            Pages, page IDs or canonical names.
+        category: str or TraitProxy, optional
+            Only the traits of this category (or predicate), as `get_traits` does.
+        chunk: int, default 50
+            Number of pages in a query. A larger chunk makes fewer but heavier queries.
+        rows_per_request: int, default 1000
+            Rows fetched per request while paginating the result of a query.
+        concurrency: int, default 4
+            Number of queries executed at once.
+
+        Returns
+        -------
+        dict of each item of `pages` to the list of its traits, which is empty for an unknown page.
+        A canonical name shared by several pages gets the traits of the one with the smallest page ID.
+
+        Example
+        =======
+        traits = await Page.get_traits_many(executor, [46559130, 'Lutra lutra'], category='body mass')
+        """
+        pages = list(pages)
+        # Pages are matched by page_id where it is known, otherwise by canonical name
+        by_key = {}
+        for page in pages:
+            if isinstance(page, Page):
+                key = ('page_id', int(page.page_id)) if page.page_id else ('canonical', page.canonical)
+            elif isinstance(page, str):
+                key = ('canonical', page)
+            else:
+                key = ('page_id', int(page))
+            by_key.setdefault(key, []).append(page)
+
+        # A name shared by several pages means the one with the smallest page ID, as in `from_names`
+        matches = {'page_id': 'MATCH (p:Page {page_id: key})',
+                   'canonical': 'MATCH (q:Page {canonical: key}) WITH key, min(q.page_id) AS page_id '
+                                'MATCH (p:Page {page_id: page_id})'}
+        queries = []
+        for field in ('page_id', 'canonical'):
+            values = [value for f, value in by_key if f == field]
+            for i in range(0, len(values), chunk):
+                queries.append((field, _traits_query(
+                    f'UNWIND {json.dumps(values[i:i + chunk])} AS key {matches[field]}', category,
+                    'key, properties(p), properties(t), properties(r), properties(pred), properties(obj), '
+                    'properties(units), properties(lit) ORDER BY key, p.page_id, t.eol_pk')))
+
+        traits: Dict[tuple, List[Trait]] = {key: [] for key in by_key}
+
+        async def execute(field_and_query):
+            field, query = field_and_query
+            page = None
+            async for datum in executor.execute_iter(query, chunk=rows_per_request, concurrency=1):
+                # Rows of a page are contiguous (ordered by page_id), so that they share one Page
+                if page is None or page.page_id != datum[1].get('page_id'):
+                    page = cls(executor, data=datum[1])
+                traits[(field, datum[0])].append(Trait(executor, page, datum[2], datum[3], datum[4],
+                                                       datum[5], datum[6], datum[7]))
+
+        results = bounded_as_completed(execute, queries, concurrency)
+        try:
+            async for _, result in results:
+                if isinstance(result, Exception):
+                    raise result
+        finally:
+            await results.aclose()
+        return {page: traits[key] for key, items in by_key.items() for page in items}
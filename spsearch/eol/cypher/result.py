@@ -0,0 +1,100 @@
+import keyword
+import re
+from collections import namedtuple
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, List, Union
+
+if TYPE_CHECKING:
+    import numpy
+
+
+def _field_name(column: str) -> str:
+    """Makes a column name (e.g. 'properties(t)') usable as a field name (e.g. 'properties_t').
+    A keyword gets a trailing underscore as `Species.class_` does. The others not usable are left to `namedtuple`.
+    """
+    name = re.sub(r'\W+', '_', column).strip('_')
+    return f'{name}_' if keyword.iskeyword(name) else name
+
+
+def _float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+class ColumnarResult(Sequence):
+    """Result of a Cypher query held column by column, returned by `CypherExecutor.execute_columnar`.
+
+    Each page of the result is transposed into the columns as it arrives, so no merged list of rows is made.
+    Rows are made only on access, as named tuples whose fields are the sanitized column names.
+
+    Example
+    =======
+    result = await executor.execute_columnar(query, items=None)
+    result.columns                              # ['properties(p)', 'properties(t)']
+    result.column('properties(t)')              # list of the values of the column
+    result[0].properties_t                      # a row
+    result.to_numpy('properties(t)', 'normal_measurement')
+    """
+    __slots__ = ('columns', 'fields', 'Row', '_columns', '_indices')
+
+    def __init__(self, columns: Iterable[str], rows: Iterable[Sequence] = ()):
+        self.columns: List[str] = list(columns)
+        self.Row = namedtuple('Row', [_field_name(column) for column in self.columns], rename=True)
+        self.fields: List[str] = list(self.Row._fields)
+        self._columns: List[list] = [[] for _ in self.columns]
+        self._indices = {name: i for i, name in enumerate(self.fields)}
+        self._indices.update((name, i) for i, name in enumerate(self.columns))
+        self.extend(rows)
+
+    def extend(self, rows: Iterable[Sequence]):
+        """Appends rows, e.g. the 'data' of a page."""
+        rows = rows if isinstance(rows, list) else list(rows)
+        if not rows:
+            return
+        for values, column in zip(zip(*rows), self._columns):
+            column.extend(values)
+
+    def _index(self, column: Union[str, int]) -> int:
+        if isinstance(column, int):
+            return column
+        try:
+            return self._indices[column]
+        except KeyError:
+            raise KeyError(f'No column {column!r} in {self.columns}') from None
+
+    def column(self, column: Union[str, int], key: str = None) -> list:
+        """Returns the values of the column, given by its name, field name or index.
+        With `key`, returns `value[key]` of each value (None where missing), e.g. a property of a node.
+        """
+        values = self._columns[self._index(column)]
+        if key is None:
+            return values
+        return [value.get(key) if value is not None else None for value in values]
+
+    def to_numpy(self, column: Union[str, int], key: str = None, dtype: Any = float) -> 'numpy.ndarray':
+        """Returns the column (or its `key` as `column` does) as a NumPy array.
+
+        For a float dtype, a value which is not numeric (e.g. None or 'N/A') is NaN, as in `TraitSet`.
+        NumPy is required.
+        """
+        import numpy
+        values = self.column(column, key)
+        if numpy.issubdtype(numpy.dtype(dtype), numpy.floating):
+            return numpy.fromiter(map(_float, values), dtype=dtype, count=len(values))
+        return numpy.array(values, dtype=dtype)
+
+    def __len__(self):
+        return len(self._columns[0]) if self._columns else 0
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return ColumnarResult(self.columns, zip(*(column[i] for column in self._columns)))
+        return self.Row._make(column[i] for column in self._columns)
+
+    def __iter__(self) -> Iterator[tuple]:
+        return map(self.Row._make, zip(*self._columns))
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} of {len(self)} rows: {self.columns}>'
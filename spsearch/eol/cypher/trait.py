@@ -1,11 +1,51 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Tuple, Union
+from weakref import WeakValueDictionary
 if TYPE_CHECKING:
     from .core import CypherExecutor
 
 
 class BaseTerm:
+    """Term shared by the traits, such as a predicate or units.
+
+    Terms are interned: making a term whose key (`uri`, or `resource_id` of `Resource`) is already
+    in use returns the same object, which is immutable. So a term takes memory once however many
+    traits refer to it, and terms can be compared by identity. A term is forgotten once nothing
+    refers to it. A term without the key is not interned.
+    """
+    __slots__ = ('_data', '__weakref__')
+    _fields: Tuple[str, ...] = ()
+    _key = 'uri'
+    _registry: 'WeakValueDictionary[Any, BaseTerm]'
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._registry = WeakValueDictionary()
+
+    def __new__(cls, data: dict):
+        key = data.get(cls._key)
+        if key is not None:
+            term = cls._registry.get(key)
+            if term is not None:
+                return term
+        term = super().__new__(cls)
+        object.__setattr__(term, '_data', dict(data))
+        for field in cls._fields:
+            object.__setattr__(term, field, data.get(field))
+        if key is not None:
+            cls._registry[key] = term
+        return term
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{self.__class__.__name__} is immutable.')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{self.__class__.__name__} is immutable.')
+
+    def __reduce__(self):
+        return self.__class__, (self._data,)
+
     def __hash__(self):
-        return hash(self.uri)
+        return hash(getattr(self, self._key))
 
     def __str__(self):
         return self.name
@@ -16,59 +56,42 @@ class BaseTerm:
 
 class TraitProxy(BaseTerm):
     # 軽量のTrait。最低限の情報を持つ
-    def __init__(self, uri, name):
-        self.uri = uri
-        self.name = name
+    __slots__ = _fields = ('uri', 'name')
+
+    def __new__(cls, uri, name):
+        return super().__new__(cls, {'uri': uri, 'name': name})
+
+    def __reduce__(self):
+        return self.__class__, (self.uri, self.name)
+
+
+def _category_filter(category: Union[str, TraitProxy, None]) -> str:
+    """WHERE clause which limits the predicate `pred` to `category`."""
+    if not category:
+        return ''
+    return f'WHERE pred.name = "{category}"'\
+           + (f' and pred.uri = "{category.uri}"' if isinstance(category, TraitProxy) else '')
 
 
 class Resource(BaseTerm):
-    def __init__(self, data:dict):
-        self._data = data
-        self.resource_id = data.get('resource_id')
+    __slots__ = _fields = ('resource_id', 'name')
+    _key = 'resource_id'
 
 
 class Predicate(BaseTerm):
-    def __init__(self, data: dict):
-        self._data = data
-        self.name = data.get('name')
-        self.definition = data.get('definition')
-        self.position = data.get('position')
-        self.uri = data.get('uri')
-        self.used_for = data.get('used_for')
+    __slots__ = _fields = ('name', 'definition', 'position', 'uri', 'used_for')
 
 
 class Object(BaseTerm):
-    def __init__(self, data: dict):
-        self._data = data
-        self.attribution = data.get('attribution')
-        self.definition = data.get('definition')
-        self.name = data.get('name')
-        self.uri = data.get('uri')
-        self.position = data.get('position')
-        self.type = data.get('type')
-        self.used_for = data.get('used_for')
+    __slots__ = _fields = ('attribution', 'definition', 'name', 'uri', 'position', 'type', 'used_for')
 
 
 class Units(BaseTerm):
-    def __init__(self, data: dict):
-        self._data = data
-        self.name = data.get('name')
-        self.definition = data.get('definition')
-        self.position = data.get('position')
-        self.type = data.get('type')
-        self.uri = data.get('uri')
+    __slots__ = _fields = ('name', 'definition', 'position', 'type', 'uri')
 
 
 class Literal(BaseTerm):
-    def __init__(self, data: dict):
-        self._data = data
-        self.attribution = data.get('attribution')
-        self.definition = data.get('definition')
-        self.name = data.get('name')
-        self.uri = data.get('uri')
-        self.position = data.get('position')
-        self.type = data.get('type')
-        self.used_for = data.get('used_for')
+    __slots__ = _fields = ('attribution', 'definition', 'name', 'uri', 'position', 'type', 'used_for')
 
 
 class Trait:
@@ -0,0 +1,160 @@
+from collections.abc import Sequence
+from numbers import Integral
+from typing import Dict, Iterable, List, Optional, Union
+from .result import ColumnarResult
+from .trait import BaseTerm, Predicate, Trait, Units
+
+
+def _measurement(trait: Trait) -> float:
+    try:
+        return float(trait.measurement)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+class TraitSet(Sequence):
+    """Traits whose measurements are held in a NumPy array, for analysis without a loop over the traits.
+
+    Predicates and units are held as codes into the tables of the distinct terms (`predicates` and `units`),
+    so grouping and filtering are array operations. A trait without a numeric measurement has NaN.
+    NumPy is required.
+
+    Example
+    =======
+    traits = await Page.get_traits_many(executor, page_ids)
+    traitset = TraitSet(trait for page_traits in traits.values() for trait in page_traits)
+    traitset.inconsistent_units()           # {Predicate: [Units, Units]} measured in several units
+    for row in traitset.where(units='g').stats():
+        print(row.predicate, row.count, row.mean)
+
+    Parameters
+    ----------
+    traits: Iterable of Trait
+
+    Attributes
+    ----------
+    measurements: numpy.ndarray of float
+    predicate_codes, units_codes: numpy.ndarray of int
+        Index of each trait's predicate in `predicates`, and units in `units` (where None is the traits without).
+    """
+    __slots__ = ('traits', 'measurements', 'predicates', 'predicate_codes', 'units', 'units_codes')
+
+    def __init__(self, traits: Iterable[Trait]):
+        import numpy
+        self.traits: List[Trait] = list(traits)
+        self.measurements = numpy.fromiter((_measurement(trait) for trait in self.traits), dtype=float,
+                                           count=len(self.traits))
+        self.predicates: List[Optional[Predicate]] = []
+        self.units: List[Optional[Units]] = []
+        predicate_codes: Dict[Optional[Predicate], int] = {}
+        units_codes: Dict[Optional[Units], int] = {}
+        self.predicate_codes = numpy.fromiter(
+            (self._code(trait.predicate, predicate_codes, self.predicates) for trait in self.traits),
+            dtype=numpy.intp, count=len(self.traits))
+        self.units_codes = numpy.fromiter(
+            (self._code(trait.units, units_codes, self.units) for trait in self.traits),
+            dtype=numpy.intp, count=len(self.traits))
+
+    @staticmethod
+    def _code(term: Optional[BaseTerm], codes: Dict[Optional[BaseTerm], int], table: list) -> int:
+        code = codes.get(term)
+        if code is None:
+            code = codes[term] = len(table)
+            table.append(term)
+        return code
+
+    def _take(self, indices) -> 'TraitSet':
+        """Returns the traits at `indices` (an index array, boolean mask or slice) sharing the term tables."""
+        import numpy
+        taken = object.__new__(TraitSet)
+        positions = numpy.arange(len(self.traits))[indices]
+        taken.traits = [self.traits[i] for i in positions.tolist()]
+        taken.measurements = self.measurements[positions]
+        taken.predicates, taken.predicate_codes = self.predicates, self.predicate_codes[positions]
+        taken.units, taken.units_codes = self.units, self.units_codes[positions]
+        return taken
+
+    @staticmethod
+    def _matching(table: list, term: Union[BaseTerm, str, None]) -> List[int]:
+        """Codes of the terms in `table` which are `term`, or whose name or URI is `term`."""
+        if term is None or isinstance(term, BaseTerm):
+            return [code for code, t in enumerate(table)
+                    if t is term or (t is not None and term is not None and t.uri == term.uri)]
+        return [code for code, t in enumerate(table) if t is not None and term in (t.name, t.uri)]
+
+    def where(self, predicate: Union[BaseTerm, str] = None, units: Union[BaseTerm, str, None] = ...,
+              numeric: bool = False) -> 'TraitSet':
+        """Returns the traits of `predicate` and in `units`, given as terms, names or URIs.
+
+        `units=None` selects the traits without units. `numeric=True` drops the traits without a measurement.
+        """
+        import numpy
+        mask = numpy.ones(len(self.traits), dtype=bool)
+        if predicate is not None:
+            mask &= numpy.isin(self.predicate_codes, self._matching(self.predicates, predicate))
+        if units is not ...:
+            mask &= numpy.isin(self.units_codes, self._matching(self.units, units))
+        if numeric:
+            mask &= ~numpy.isnan(self.measurements)
+        return self._take(mask)
+
+    def inconsistent_units(self) -> Dict[Predicate, List[Optional[Units]]]:
+        """Returns the predicates whose numeric traits are in more than one units, with the units."""
+        import numpy
+        numeric = ~numpy.isnan(self.measurements)
+        pairs = numpy.unique(numpy.stack([self.predicate_codes[numeric], self.units_codes[numeric]]), axis=1)
+        predicate_codes, counts = numpy.unique(pairs[0], return_counts=True)
+        return {self.predicates[code]: [self.units[u] for u in pairs[1][pairs[0] == code].tolist()]
+                for code in predicate_codes[counts > 1].tolist()}
+
+    def stats(self, by_units: bool = True) -> ColumnarResult:
+        """Computes count, mean, std, min and max of the numeric measurements per predicate (and units).
+
+        Returns
+        -------
+        ColumnarResult of 'predicate', 'units' (if `by_units`), 'count', 'mean', 'std', 'min' and 'max'.
+        """
+        import numpy
+        numeric = ~numpy.isnan(self.measurements)
+        values = self.measurements[numeric]
+        # One code per (predicate, units) pair
+        codes = self.predicate_codes[numeric]
+        if by_units:
+            codes = codes * len(self.units) + self.units_codes[numeric]
+        groups, inverse, counts = numpy.unique(codes, return_inverse=True, return_counts=True)
+        inverse = inverse.reshape(-1)
+
+        sums = numpy.bincount(inverse, weights=values, minlength=len(groups))
+        means = sums / counts
+        squares = numpy.bincount(inverse, weights=(values - means[inverse]) ** 2, minlength=len(groups))
+        stds = numpy.sqrt(squares / counts)
+        minimums = numpy.full(len(groups), numpy.inf)
+        numpy.minimum.at(minimums, inverse, values)
+        maximums = numpy.full(len(groups), -numpy.inf)
+        numpy.maximum.at(maximums, inverse, values)
+
+        if by_units:
+            keys = [(self.predicates[code // len(self.units)], self.units[code % len(self.units)])
+                    for code in groups.tolist()]
+            columns = ['predicate', 'units']
+        else:
+            keys = [(self.predicates[code],) for code in groups.tolist()]
+            columns = ['predicate']
+        return ColumnarResult(columns + ['count', 'mean', 'std', 'min', 'max'],
+                              [key + stat for key, stat in zip(keys, zip(counts.tolist(), means.tolist(),
+                                                                         stds.tolist(), minimums.tolist(),
+                                                                         maximums.tolist()))])
+
+    def __len__(self):
+        return len(self.traits)
+
+    def __getitem__(self, i):
+        if isinstance(i, Integral):
+            return self.traits[i]
+        return self._take(i)
+
+    def __iter__(self):
+        return iter(self.traits)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} of {len(self)} traits, {len(self.predicates)} predicates>'
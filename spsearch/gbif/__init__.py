@@ -1 +1,8 @@
-from .core import Species
+from typing import TYPE_CHECKING
+from .._lazy import lazy
+
+if TYPE_CHECKING:
+    from .core import Species
+
+__all__ = ['Species']
+__getattr__, __dir__ = lazy(__name__, globals(), {'Species': '.core'})
@@ -1,9 +1,11 @@
 import aiohttp
 from yarl import URL
 from ..classes import AttrDict
+from ..ratelimit import rate_limiter
 from typing import AsyncGenerator, List
 
 base_url = URL('http://api.gbif.org/v1/')
+rate_limiter.setdefault(base_url.host, rate=5)
 
 async def _get(url: URL, paging =False, chunk_size: int =100) -> AsyncGenerator[None, AttrDict]:
     data = {}
@@ -12,7 +14,7 @@ async def _get(url: URL, paging =False, chunk_size: int =100) -> AsyncGenerator[
         async with aiohttp.ClientSession() as session:
             if paging:
                 url = url.with_query(offset=offset, limit=chunk_size)
-            async with session.get(url) as resp:
+            async with rate_limiter.request(session, 'GET', url) as resp:
                 assert resp.status == 200, f"{resp.status}: {resp.reason}"
                 data = await resp.json()
 
@@ -1 +1,8 @@
-from .taxa import taxon_search
+from typing import TYPE_CHECKING
+from .._lazy import lazy
+
+if TYPE_CHECKING:
+    from .taxa import taxon_search
+
+__all__ = ['taxon_search']
+__getattr__, __dir__ = lazy(__name__, globals(), {'taxon_search': '.taxa'})
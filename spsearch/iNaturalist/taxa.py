@@ -4,6 +4,10 @@ from yarl import URL
 from ._const import BASE_URL
 from copy import deepcopy
 from ..classes import AttrSeq
+from ..ratelimit import rate_limiter
+
+# iNaturalist asks to keep it around 60 requests per minute
+rate_limiter.setdefault(URL(BASE_URL).host, rate=1)
 
 
 async def taxon_search(q: str, is_active: bool =None, taxon_id: Sequence[int] =None, parent_id: int =None,
@@ -58,7 +62,7 @@ async def taxon_search(q: str, is_active: bool =None, taxon_id: Sequence[int] =N
     url = (URL(BASE_URL) / 'taxa').with_query(**kwargs)
 
     async with aiohttp.ClientSession() as session:
-        async with session.get(url) as resp:
+        async with rate_limiter.request(session, 'GET', url) as resp:
             assert resp.status == 200, f"{resp.status}: {resp.reason}"
             data = await resp.json()
 
@@ -0,0 +1,105 @@
+import codecs
+import json
+from typing import Any, AsyncGenerator, AsyncIterable
+
+_decoder = json.JSONDecoder()
+_whitespace = ' \t\n\r'
+# Characters which may follow a complete number
+_number_ends = _whitespace + ',]}'
+
+
+class _Reader:
+    """Incrementally decodes JSON text coming in chunks of bytes."""
+    def __init__(self, chunks: AsyncIterable[bytes], encoding: str = 'utf-8'):
+        self._chunks = chunks.__aiter__()
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    async def _fill(self) -> bool:
+        """Reads the next chunk into the buffer. Returns False at the end of the stream."""
+        if self._eof:
+            return False
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._eof = True
+            text = self._decoder.decode(b'', final=True)
+        else:
+            text = self._decoder.decode(chunk)
+        # Drop what has been consumed, so that the buffer holds about one item at most
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        return True
+
+    async def peek(self) -> str:
+        """Returns the next non-whitespace character without consuming it."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _whitespace:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not await self._fill():
+                raise ValueError('Unexpected end of JSON.')
+
+    async def expect(self, chars: str) -> str:
+        """Consumes the next non-whitespace character, which has to be one of `chars`."""
+        char = await self.peek()
+        if char not in chars:
+            raise ValueError(f'Expected one of {chars!r} but got {char!r} at {self._pos}.')
+        self._pos += 1
+        return char
+
+    async def value(self) -> Any:
+        """Decodes and consumes the next JSON value."""
+        await self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not await self._fill():
+                    raise
+                continue
+            # A number may be cut off at the end of the buffer (e.g. 12 of 123, or 1 of 1.5 and 1e5),
+            # which `raw_decode` takes as a shorter number. It is complete only before a delimiter or at EOF.
+            if (self._buffer[self._pos] in '-0123456789'
+                    and (end == len(self._buffer) or self._buffer[end] not in _number_ends)
+                    and await self._fill()):
+                continue
+            self._pos = end
+            return value
+
+
+async def iter_json_array(chunks: AsyncIterable[bytes], key: str, encoding: str = 'utf-8'
+                          ) -> AsyncGenerator[Any, None]:
+    """Yields the items of the array under `key` of a JSON object, decoding them as the chunks arrive.
+
+    Only one item is held in memory at a time, however long the array is.
+    Nothing is yielded if the object does not have `key`.
+
+    Example
+    =======
+    async with session.get(url) as response:
+        async for item in iter_json_array(response.content.iter_chunked(65536), 'result'):
+            print(item)
+    """
+    reader = _Reader(chunks, encoding)
+    await reader.expect('{')
+    if await reader.peek() == '}':
+        return
+    while True:
+        name = await reader.value()
+        await reader.expect(':')
+        if name == key and await reader.peek() == '[':
+            await reader.expect('[')
+            if await reader.peek() == ']':
+                return
+            while True:
+                yield await reader.value()
+                if await reader.expect(',]') == ']':
+                    return
+        else:
+            await reader.value()
+        if await reader.expect(',}') == '}':
+            return
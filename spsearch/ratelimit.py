@@ -0,0 +1,148 @@
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from itertools import count
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """Lets `rate` requests per second through, allowing bursts of up to `capacity` requests.
+
+    Parameters
+    ----------
+    rate: float
+        Tokens added per second.
+    capacity: float, optional
+        Maximum number of tokens. Defaults to `rate` (but at least 1).
+    """
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1., rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.
+
+    async def acquire(self):
+        """Takes a token, waiting until one is available."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        # Reserve the token at once, so that concurrent callers queue up without a lock
+        self._tokens -= 1
+        if self._tokens < 0:
+            try:
+                await asyncio.sleep(-self._tokens / self.rate)
+            except asyncio.CancelledError:
+                # Give the reserved token back, or every cancelled waiter would slow down the ones after it
+                self._tokens += 1
+                raise
+        while self._paused_until > time.monotonic():
+            await asyncio.sleep(self._paused_until - time.monotonic())
+
+    def pause(self, seconds: float):
+        """Holds back every request for `seconds`, e.g. when the server asked to by Retry-After."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class RateLimiter:
+    """Rate limits requests with a token bucket per host, and retries throttled or failed requests.
+
+    A response with a status in `retry_statuses` is retried after the delay given by its Retry-After header,
+    or else after a jittered exponential backoff. Once `max_retries` is exhausted, the response is returned as is.
+
+    Parameters
+    ----------
+    rate: float, optional
+        Requests per second for the hosts which are not configured by `limit`. None is unlimited.
+    burst: float, optional
+        Bucket capacity for such hosts.
+    max_retries: int, default 5
+    backoff: float, default 0.5
+        Base seconds of the exponential backoff.
+    max_backoff: float, default 60
+        Upper bound of the exponential backoff.
+    retry_statuses: tuple of int, default (429, 500, 502, 503, 504)
+    """
+    def __init__(self, rate: float = None, burst: float = None, *, max_retries: int = 5, backoff: float = .5,
+                 max_backoff: float = 60., retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)):
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_statuses = retry_statuses
+        self._limits: Dict[str, Tuple[Optional[float], Optional[float]]] = {}
+        self._buckets: Dict[str, Optional[TokenBucket]] = {}
+
+    def limit(self, host: str, rate: Optional[float], burst: float = None):
+        """Sets requests per second (and bucket capacity) for `host`. None is unlimited."""
+        self._limits[host] = (rate, burst)
+        self._buckets.pop(host, None)
+
+    def setdefault(self, host: str, rate: Optional[float], burst: float = None):
+        """Sets the limit for `host` unless it has been set already. Used by the provider modules."""
+        if host not in self._limits:
+            self.limit(host, rate, burst)
+
+    def bucket(self, host: str) -> Optional[TokenBucket]:
+        if host not in self._buckets:
+            rate, burst = self._limits.get(host, (self.rate, self.burst))
+            self._buckets[host] = TokenBucket(rate, burst) if rate else None
+        return self._buckets[host]
+
+    def _retry_after(self, response) -> Optional[float]:
+        value = response.headers.get('Retry-After')
+        if value is None:
+            return None
+        try:
+            return max(0., float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0., (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    async def send(self, session, method: str, url, **kwargs):
+        """Sends a request through `session` (aiohttp.ClientSession) and returns the response.
+        The caller has to release the response; `request` does it for you.
+        """
+        bucket = self.bucket(urlsplit(str(url)).hostname)
+        for attempt in count():
+            if bucket is not None:
+                await bucket.acquire()
+            response = await session.request(method, url, **kwargs)
+            if response.status not in self.retry_statuses or attempt >= self.max_retries:
+                return response
+
+            delay = self._retry_after(response)
+            response.release()
+            if delay is None:
+                delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+            elif bucket is not None:
+                # The server is throttling the host, so hold back the other requests as well
+                bucket.pause(delay)
+            await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def request(self, session, method: str, url, **kwargs):
+        """Async context manager version of `send`.
+
+        Example
+        =======
+        async with rate_limiter.request(session, 'GET', url, params=params) as response:
+            data = await response.json()
+        """
+        response = await self.send(session, method, url, **kwargs)
+        try:
+            yield response
+        finally:
+            response.release()
+
+
+# Shared by all the providers, so that requests to the same host share a bucket
+rate_limiter = RateLimiter()
@@ -1,5 +1,18 @@
-from .handler import RedListApiHandler
-from .species import Species
-from .habitats import Habitat
-from .threats import Threat
-from .conservation_measures import ConservationMeasure
+from typing import TYPE_CHECKING
+from .._lazy import lazy
+
+if TYPE_CHECKING:
+    from .handler import RedListApiHandler
+    from .species import Species
+    from .habitats import Habitat
+    from .threats import Threat
+    from .conservation_measures import ConservationMeasure
+
+__all__ = ['RedListApiHandler', 'Species', 'Habitat', 'Threat', 'ConservationMeasure']
+__getattr__, __dir__ = lazy(__name__, globals(), {
+    'RedListApiHandler': '.handler',
+    'Species': '.species',
+    'Habitat': '.habitats',
+    'Threat': '.threats',
+    'ConservationMeasure': '.conservation_measures',
+})
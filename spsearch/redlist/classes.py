@@ -1,5 +1,7 @@
-from typing import Iterable, List, Union
-from itertools import dropwhile, zip_longest
+from typing import Dict, Iterable, List, Tuple, Union
+from bisect import bisect_left
+from collections import Counter
+from math import inf
 from ..classes import AttrDict
 
 
@@ -13,36 +15,50 @@ class Synonym(AttrDict):
         return f"<Synonym for {self.accepted_name}: {self.synonym}>"
 
 
+def _parse_code(code: str) -> Tuple[int, ...]:
+    return tuple(int(i) for i in code.split('.')) if code else ()
+
+
 class CodeHierarchySeq:
+    """Container of hierarchical code objects (e.g. `Threat`) sorted by their codes.
+
+    Each code is parsed once into a tuple of int (e.g. '7.2.11' -> (7, 2, 11)) and kept in a sorted index,
+    so a subtree is found by bisection in O(log n + k) instead of scanning every item.
+    """
     def __init__(self, *args, codepoint: str ='', **kwargs):
         # Correct the order (from 1.5 -> 12.5 -> 3.6 to 1.5 -> 3.6 -> 12.5)
-        self._list = sorted(list(*args, **kwargs), key=lambda x: [int(i) for i in x.code.split('.')])
+        pairs = sorted(((_parse_code(obj.code), obj) for obj in list(*args, **kwargs)), key=lambda pair: pair[0])
+        self._keys = [key for key, _ in pairs]
+        self._list = [obj for _, obj in pairs]
         self.codepoint = str(codepoint)
 
+    @classmethod
+    def _from_sorted(cls, keys: List[Tuple[int, ...]], objs: list, codepoint: str) -> 'CodeHierarchySeq':
+        hierarchy = cls.__new__(cls)
+        hierarchy._keys = keys
+        hierarchy._list = objs
+        hierarchy.codepoint = codepoint
+        return hierarchy
+
+    def _range(self, prefix: Tuple[int, ...]) -> Tuple[int, int]:
+        """Returns the range of the items whose codes start with `prefix`."""
+        return bisect_left(self._keys, prefix), bisect_left(self._keys, prefix + (inf,))
+
     def __iter__(self):
         return iter(self._list)
 
+    def __len__(self):
+        return len(self._list)
+
     def __getitem__(self, following_code: int):
         if isinstance(following_code, slice):
             raise SyntaxError('Use .slice() for slicing this object.')
 
         basecode = f'{self.codepoint}.{following_code}'.lstrip('.')
-
-        def is_following_to_basecode(obj):
-            basecode_split = basecode.split('.')
-            target_code_split = obj.code.split('.')
-            for i, _ in enumerate(basecode_split):
-                try:
-                    if basecode_split[i] != target_code_split[i]:
-                        return False
-                except IndexError:
-                    return False
-            return True
-
-        returning = CodeHierarchySeq(filter(is_following_to_basecode, self), codepoint=basecode)
-        if not returning:
+        lo, hi = self._range(_parse_code(basecode))
+        if lo == hi:
             raise IndexError(f'Codepoint {basecode} does not match any.')
-        return returning
+        return self._from_sorted(self._keys[lo:hi], self._list[lo:hi], basecode)
 
     def slice(self, x):
         return self._list[x]
@@ -56,6 +72,27 @@ class CodeHierarchySeq:
     def __bool__(self):
         return bool(self._list)
 
+    def contains(self, code: str) -> bool:
+        """Whether an item with exactly the code is in this hierarchy."""
+        key = _parse_code(code)
+        i = bisect_left(self._keys, key)
+        return i < len(self._keys) and self._keys[i] == key
+
+    def descendants(self, code: str) -> 'CodeHierarchySeq':
+        """Returns the items under the code, not including the item with the code itself.
+
+        e.g. descendants('2.4') -> CodeHierarchySeq([<Threat 2.4.3: Scale Unknown/Unrecorded>])
+        """
+        key = _parse_code(code)
+        lo, hi = self._range(key)
+        if lo < hi and self._keys[lo] == key:
+            lo += 1
+        return self._from_sorted(self._keys[lo:hi], self._list[lo:hi], str(code))
+
+    def depth_counts(self) -> Dict[int, int]:
+        """Returns the number of the items for each rank (0 for '1', 1 for '1.1', and so on)."""
+        return dict(sorted(Counter(len(key) - 1 for key in self._keys).items()))
+
     def codes(self) -> List[int]:
         """Returns the code under this CodeHierarchy
 
@@ -93,12 +130,8 @@ class CodeHierarchySeq:
         ])
         print(hierarchy.codes())    # [1, 2, 4, 5, 6, 7, 9]
         """
-        codes = []
-        for obj in self:
-            codepoint_iter = iter(self.codepoint.split('.'))
-            deeper_code = dropwhile(lambda x: x == next(codepoint_iter), obj.code)
-            codes.append(int(next(deeper_code)))
-        return sorted(list(set(codes)))
+        depth = len(_parse_code(self.codepoint))
+        return sorted(set(key[depth] for key in self._keys if len(key) > depth))
 
     def iterate_with_rank0(self):
         """Generator to iterate the hierarchy with zero-rank codepoint.
@@ -120,9 +153,9 @@ class CodeHierarchySeq:
         if not self._list:
             return
         cls = self.slice(0).__class__
-        i = '0'
-        for obj in self:
-            if i != obj.code.split('.')[0]:
-                yield cls(obj.code.split('.')[0])
+        rank0 = None
+        for key, obj in zip(self._keys, self._list):
+            if rank0 != key[0]:
+                rank0 = key[0]
+                yield cls(str(rank0))
             yield obj
-            i = obj.code.split('.')[0]
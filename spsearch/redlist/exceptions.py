@@ -1,2 +1,7 @@
 class NotFoundError(Exception):
     pass
+
+
+class OfflineError(Exception):
+    """Raised when a response is not in the cache in offline mode."""
+    pass
@@ -1,24 +1,123 @@
+import asyncio
+import warnings
 import aiohttp
-from typing import Union, Mapping, Dict, TextIO, List
+from typing import Union, Mapping, Dict, TextIO, Iterable, AsyncGenerator, Tuple
+from ..asynctools import bounded_as_completed
 from .classes import Synonym
-from ..classes import AttrDict, AttrSeq
-from .exceptions import NotFoundError
+from ..cache import ResponseCache
+from ..ratelimit import RateLimiter, rate_limiter
+from ..classes import AttrDict
+from ..jsonstream import iter_json_array
+from ..singleflight import SingleFlight
+from .exceptions import NotFoundError, OfflineError
+from .index import SpeciesIndex
+from .redirects import RedirectMap
 from .species import Species
+from .table import SpeciesTable
 
 
 base_url = 'http://apiv3.iucnredlist.org/api/v3/'
+rate_limiter.setdefault('apiv3.iucnredlist.org', rate=5)
 
 
 class RedListApiHandler:
-    """Represent Red List API"""
-    def __init__(self, token: Union[str, TextIO]):
+    """Represent Red List API
+
+    The handler owns a pool of connections which is shared by every request made through it,
+    including the ones made by `Species`. Close it with `close()`, or use the handler as an async context manager:
+
+        async with RedListApiHandler(token) as handler:
+            otter = await handler.species_from_name('Lutra lutra')
+
+    Parameters
+    ----------
+    token: str or file-like
+        Red List API token.
+    limit: int, default 100
+        Total number of simultaneous connections.
+    limit_per_host: int, default 10
+        Number of simultaneous connections to the same host.
+    keepalive_timeout: float, default 30
+        Seconds to keep an idle connection alive for reuse.
+    ttl_dns_cache: int, default 300
+        Seconds to cache resolved DNS records. None caches them forever.
+    cache: ResponseCache, optional
+        Cache for the responses of `get`. Give `ResponseCache('redlist.sqlite', offline=True)` to work without
+        network from a cache filled before.
+    rate_limiter: RateLimiter, optional
+        Defaults to the one shared by all the providers (`spsearch.ratelimit.rate_limiter`).
+    index: SpeciesIndex, optional
+        Local index which answers lookups by name, ID and category before the API does.
+    redirects: RedirectMap, optional
+        Map of old taxon IDs to the current ones used by `species_from_id(_ensured)`.
+        Defaults to an in-memory map; give `RedirectMap(path)` to keep it across runs.
+    name_strategy: str, default 'sequential'
+        Default strategy of `species_from_name`. See there.
+    race_delay: float, default 0.2
+        Default seconds to wait before starting the canonical lookup with 'race-after-delay'.
+
+    Attributes
+    ----------
+    inflight: SingleFlight
+        Identical concurrent `get` share one request through this.
+        `inflight.hits` counts the requests saved by it.
+    """
+    def __init__(self, token: Union[str, TextIO], *, limit: int = 100, limit_per_host: int = 10,
+                 keepalive_timeout: float = 30, ttl_dns_cache: int = 300, cache: ResponseCache = None,
+                 rate_limiter: RateLimiter = rate_limiter, index: SpeciesIndex = None,
+                 redirects: RedirectMap = None, name_strategy: str = 'sequential', race_delay: float = 0.2):
         if isinstance(token, str):
             self.token = token
         else:
             self.token = token.read()
-
-    async def get(self, endpoint: str, params: Mapping[str, str] = {}, base_url: str = base_url, token: bool = None,
-                  **kwargs) -> Dict:
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.index = index
+        self.redirects = redirects if redirects is not None else RedirectMap()
+        self.name_strategy = name_strategy
+        self.race_delay = race_delay
+        self.inflight = SingleFlight()
+
+        self._connector_options = dict(limit=limit, limit_per_host=limit_per_host,
+                                       keepalive_timeout=keepalive_timeout, ttl_dns_cache=ttl_dns_cache)
+        self._session = None
+        self._session_loop = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Pooled session shared by the requests to the API.
+
+        It is created on first use, and created again when used from another event loop.
+        """
+        loop = asyncio.get_event_loop()
+        if self._session is not None and not self._session.closed and self._session_loop is not loop:
+            # The session belongs to the other loop, which may be closed already, so it cannot be closed from here
+            warnings.warn('RedListApiHandler is used from a new event loop, dropping the session of the previous '
+                          'one unclosed. Use `async with handler:` or `await handler.close()` in each event loop.',
+                          RuntimeWarning, stacklevel=2)
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(**self._connector_options)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._session_loop = loop
+        return self._session
+
+    async def close(self):
+        """Closes the pooled session. Requests still in flight are cancelled."""
+        self.inflight.cancel()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
+    async def __aenter__(self) -> 'RedListApiHandler':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def _prepare(self, endpoint: str, params: Mapping[str, str], base_url: str, token: bool,
+                 kwargs: Mapping[str, str]) -> Tuple[str, Dict[str, str], str]:
+        """Returns the URL, the query parameters and the cache key of the request."""
         if token is None:
             if any(s in endpoint for s in [
                 '/api/v3/version',
@@ -30,16 +129,59 @@ class RedListApiHandler:
             else:
                 token = True
 
-        from urllib.parse import quote, urljoin
+        from urllib.parse import quote, urljoin, urlencode
         url = urljoin(base_url, quote(endpoint))
         params = {quote(k): quote(v) for (k, v) in params.items()}
         params.update(**kwargs)
+
+        # The token is excluded from the key so that the cache can be shared with other tokens
+        key = quote(endpoint) + ('?' + urlencode(sorted(params.items())) if params else '')
         if token:
             params.update(token=self.token)
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                assert response.status == 200, f"{response.status}: {response.reason}"
-                return AttrDict(await response.json())
+        return url, params, key
+
+    async def get(self, endpoint: str, params: Mapping[str, str] = {}, base_url: str = base_url, token: bool = None,
+                  **kwargs) -> Dict:
+        url, params, key = self._prepare(endpoint, params, base_url, token, kwargs)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return AttrDict(cached)
+            if self.cache.offline:
+                raise OfflineError(f'{key} is not cached.')
+
+        data = await self.inflight.do((base_url, key), self._fetch, url, params, key)
+        return AttrDict(data)
+
+    async def iter_results(self, endpoint: str, params: Mapping[str, str] = {}, base_url: str = base_url,
+                           token: bool = None, **kwargs) -> AsyncGenerator[AttrDict, None]:
+        """Yields the items of the 'result' array of the response, decoding them as the response body arrives.
+
+        Unlike `get`, the response is neither held as a whole nor stored in `cache`,
+        although a response already in `cache` is used.
+        """
+        url, params, key = self._prepare(endpoint, params, base_url, token, kwargs)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                for item in cached['result']:
+                    yield AttrDict(item)
+                return
+            if self.cache.offline:
+                raise OfflineError(f'{key} is not cached.')
+
+        async with self.rate_limiter.request(self.session, 'GET', url, params=params) as response:
+            assert response.status == 200, f"{response.status}: {response.reason}"
+            async for item in iter_json_array(response.content.iter_chunked(65536), 'result'):
+                yield AttrDict(item)
+
+    async def _fetch(self, url: str, params: Mapping[str, str], key: str) -> Dict:
+        async with self.rate_limiter.request(self.session, 'GET', url, params=params) as response:
+            assert response.status == 200, f"{response.status}: {response.reason}"
+            data = await response.json()
+        if self.cache is not None:
+            self.cache.set(key, data)
+        return data
 
     async def species_from_id_ensured(self, id, get_info=False) -> Species:
         """Gets species from IUCN taxon ID.
@@ -60,12 +202,24 @@ class RedListApiHandler:
         -------
         :class:`Species`
         """
-        async with aiohttp.ClientSession() as session:
-            async with session.head(f'http://apiv3.iucnredlist.org/api/v3/taxonredirect/{id}',
-                                    allow_redirects=True) as resp:
+        if self.index is not None:
+            # The index only has the current IDs, so no redirect is needed
+            row = self.index.by_id(id)
+            if row is not None:
+                species = self._species_from_index(row)
+                if get_info:
+                    await species.get_info()
+                return species
+
+        current_id = self.redirects.get(id, ensured=True)
+        if current_id is None:
+            async with self.rate_limiter.request(self.session, 'HEAD',
+                                                 f'http://apiv3.iucnredlist.org/api/v3/taxonredirect/{id}',
+                                                 allow_redirects=True) as resp:
                 url = resp.url
                 assert url.host == 'www.iucnredlist.org', f'Species for id {id} not found.'
-        current_id = int(url.path.split('/')[-1])
+            current_id = int(url.path.split('/')[-1])
+            self.redirects.set(id, current_id, ensured=True)
         species = Species(self, current_id)
         if get_info:
             await species.get_info()
@@ -90,35 +244,186 @@ class RedListApiHandler:
         -------
         :class:`Species`
         """
-        async with aiohttp.ClientSession() as session:
-            async with session.head(f'http://apiv3.iucnredlist.org/api/v3/taxonredirect/{id}',
-                                    allow_redirects=False) as resp:
+        if self.index is not None:
+            # The index only has the current IDs, so no redirect is needed
+            row = self.index.by_id(id)
+            if row is not None:
+                species = self._species_from_index(row)
+                if get_info:
+                    await species.get_info()
+                return species
+
+        current_id = self.redirects.get(id)
+        if current_id is None:
+            async with self.rate_limiter.request(self.session, 'HEAD',
+                                                 f'http://apiv3.iucnredlist.org/api/v3/taxonredirect/{id}',
+                                                 allow_redirects=False) as resp:
                 assert int(resp.status/100) == 3, f'Species for id {id} not found.'
                 url = resp.headers['Location']
-        current_id = int(url.split('/')[-1])
+            current_id = int(url.split('/')[-1])
+            self.redirects.set(id, current_id)
         species = Species(self, current_id)
         if get_info:
             await species.get_info()
         return species
 
+    async def species_from_ids(self, ids: Iterable[Union[str, int]], ensured: bool = False, get_info: bool = False,
+                               concurrency: int = 10
+                               ) -> AsyncGenerator[Tuple[Union[str, int], Union[Species, Exception]], None]:
+        """Gets species for many taxon IDs, keeping `concurrency` lookups in flight.
+        IDs already in `redirects` are resolved without any request.
+
+        Parameters
+        ----------
+        ids: Iterable of str or int
+            Taxon IDs of the species. Old ones are accepted.
+        ensured: bool, default False
+            If True, use `species_from_id_ensured` instead of `species_from_id`.
+        get_info: bool, default False
+            If True, do `get_info` at once.
+        concurrency: int, default 10
+            number of lookups in flight at once.
+
+        Yields
+        ------
+        (id, :class:`Species` or Exception)
+            in the order of completion. A failure is yielded in place of the species.
+        """
+        lookup = self.species_from_id_ensured if ensured else self.species_from_id
+        lookups = bounded_as_completed(lambda id: lookup(id, get_info=get_info), ids, concurrency)
+        try:
+            async for id, species in lookups:
+                yield id, species
+        finally:
+            await lookups.aclose()
+
+    def _species_from_index(self, row: Tuple[int, str, str]) -> Species:
+        taxonid, name, category = row
+        synonyms = [Synonym(s) for s in self.index.synonyms(taxonid)]
+        species = Species(self, taxonid, name, synonyms=synonyms or None)
+        species.category = category
+        return species
+
 
-    async def species_from_name(self, name) -> Species:
+    async def species_from_name(self, name, strategy: str = None, delay: float = None) -> Species:
         """Gets species from scientific name and synonym.
 
+        The synonym is looked up first, and the canonical name is looked up if it is not found.
+        Either way, the result of the synonym lookup takes precedence.
+
         Parameters
         ----------
         name: str
             scientific name of the species.
+        strategy: str, default `name_strategy` of the handler
+            'sequential': starts the canonical lookup after the synonym lookup fails.
+            'race': starts both lookups at once. Faster for canonical names, at the cost of extra requests.
+            'race-after-delay': starts the canonical lookup if the synonym lookup is not done in `delay` seconds.
+        delay: float, default `race_delay` of the handler
+            used with 'race-after-delay'.
 
         Returns
         -------
         :class:`Species`
+            Note that `get_info` is not done when the species is found in `index`.
         """
+        if self.index is not None:
+            row = self.index.by_name(name)
+            if row is not None:
+                return self._species_from_index(row)
+
+        strategy = strategy or self.name_strategy
+        if strategy == 'sequential':
+            try:
+                return await self.species_from_synonym(name, get_info=True)
+            except NotFoundError:
+                return await self.species_from_canonical_name(name)
+        elif strategy not in ('race', 'race-after-delay'):
+            raise ValueError(f'Unknown strategy: {strategy}')
+
+        synonym = asyncio.ensure_future(self.species_from_synonym(name, get_info=False))
+        canonical = None
         try:
-            return await self.species_from_synonym(name, get_info=True)
-        except NotFoundError:
-            return await self.species_from_canonical_name(name)
+            if strategy == 'race-after-delay':
+                await asyncio.wait({synonym}, timeout=self.race_delay if delay is None else delay)
+            if not synonym.done():
+                canonical = asyncio.ensure_future(self.species_from_canonical_name(name))
+
+            try:
+                species = await synonym
+            except NotFoundError:
+                return await (canonical or self.species_from_canonical_name(name))
+
+            if canonical is not None:
+                # The canonical lookup brings the same information as get_info
+                try:
+                    found = await canonical
+                except Exception:
+                    found = None
+                if found is not None and found.id == species.id:
+                    found.synonyms = species.synonyms
+                    return found
+            await species.get_info()
+            return species
+        finally:
+            for task in (synonym, canonical):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def species_many(self, names: Iterable[str], concurrency: int = 10
+                           ) -> AsyncGenerator[Tuple[str, Union[Species, Exception]], None]:
+        """Gets species for many names via `species_from_name`, keeping `concurrency` lookups in flight.
+
+        A failure of one lookup (e.g. `NotFoundError`) is yielded in place of the species
+        and does not stop the others.
 
+        Parameters
+        ----------
+        names: Iterable of str
+            scientific names of the species. Consumed lazily, so a generator is fine.
+        concurrency: int, default 10
+            number of lookups in flight at once.
+
+        Yields
+        ------
+        (name, :class:`Species` or Exception)
+            in the order of completion.
+
+        Example
+        =======
+        async for name, species in handler.species_many(names, concurrency=20):
+            if isinstance(species, Exception):
+                print(f'{name}: {species}')
+        """
+        lookups = bounded_as_completed(self.species_from_name, names, concurrency)
+        try:
+            async for name, species in lookups:
+                yield name, species
+        finally:
+            # Cancel the lookups in flight right away when the caller stops early
+            await lookups.aclose()
+
+    async def fetch_all(self, species: Iterable[Species], concurrency: int = 10
+                        ) -> AsyncGenerator[Tuple[Species, Union[Species, Exception]], None]:
+        """Runs `Species.fetch_all` for many species, keeping `concurrency` of them in flight.
+
+        Parameters
+        ----------
+        species: Iterable of :class:`Species`
+        concurrency: int, default 10
+            number of species fetched at once. Each of them makes up to 5 requests concurrently.
+
+        Yields
+        ------
+        (:class:`Species`, :class:`Species` or Exception)
+            in the order of completion. A failure is yielded in place of the species.
+        """
+        fetches = bounded_as_completed(Species.fetch_all, species, concurrency)
+        try:
+            async for sp, result in fetches:
+                yield sp, result
+        finally:
+            await fetches.aclose()
 
     async def species_from_synonym(self, name, get_info=True) -> Species:
         """Gets species from canonical scientific name and synonym.
@@ -166,19 +471,10 @@ class RedListApiHandler:
             raise NotFoundError(f'{name} not found. Is it a scientific name (Latin name)?')
         result = data['result'][0]
         species = Species(self, id=result.taxonid, name=result.scientific_name)
-
-        species.got_info = True
-        species._data = result
-        for key in result:
-            if key == 'class':
-                setattr(species, key + '_', result[key])
-            elif key == 'authority':
-                pass
-            else:
-                setattr(species, key, result[key])
+        species._set_info(result)
         return species
 
-    async def species_from_category(self, category: str) -> List[Species]:
+    async def species_from_category(self, category: str) -> SpeciesTable:
         """Gets a list of species for the category.
 
         Parameters
@@ -189,14 +485,41 @@ class RedListApiHandler:
 
         Returns
         -------
-        List of :class:`Species`
+        :class:`SpeciesTable`
+            Sequence of :class:`Species`, which are made when accessed.
         """
         assert category in ("DD", "LC", "NT", "VU", "EN", "CR", "EW", "EX", "LR/lc", "LR/nt", "LR/cd")
-        category = category.replace('/', '')
-        data = await self.get(f'/api/v3/species/category/{category}')
-        return [Species(self, sp['taxonid'], sp['scientific_name']) for sp in data['result']]
+        if self.index is not None and self.index.has_category(category):
+            return SpeciesTable(self, self.index.by_category(category))
+        data = await self.get(f'/api/v3/species/category/{category.replace("/", "")}')
+        return SpeciesTable.from_results(self, data['result'], category)
+
+    async def iter_species_from_category(self, category: str) -> AsyncGenerator[Species, None]:
+        """Yields species for the category as the response arrives.
 
-    async def species_from_country(self, country: str) -> List[Species]:
+        Same as `species_from_category` but the memory use stays flat whatever the size of the category.
+
+        Parameters
+        ----------
+        category: str
+            Conservation category. Must be one of the following:
+            "DD", "LC", "NT", "VU", "EN", "CR", "EW", "EX", "LR/lc", "LR/nt", "LR/cd"
+
+        Yields
+        ------
+        :class:`Species`
+        """
+        assert category in ("DD", "LC", "NT", "VU", "EN", "CR", "EW", "EX", "LR/lc", "LR/nt", "LR/cd")
+        if self.index is not None and self.index.has_category(category):
+            for row in self.index.by_category(category):
+                yield self._species_from_index(row)
+            return
+        async for sp in self.iter_results(f'/api/v3/species/category/{category.replace("/", "")}'):
+            species = Species(self, sp['taxonid'], sp['scientific_name'])
+            species.category = sp.get('category', category)
+            yield species
+
+    async def species_from_country(self, country: str) -> SpeciesTable:
         """Gets a list of species in the country.
 
         Parameters
@@ -207,11 +530,35 @@ class RedListApiHandler:
 
         Returns
         -------
-        List of :class:`Species`
+        :class:`SpeciesTable`
+            Sequence of :class:`Species`, which are made when accessed.
         """
         if len(country) != 2:
             import pycountry
             country = pycountry.countries.lookup(country).alpha_2
         data = await self.get(f'/api/v3/country/getspecies/{country}')
-        return [Species(self, sp['taxonid'], sp['scientific_name']) for sp in data['result']]
+        return SpeciesTable.from_results(self, data['result'])
+
+    async def iter_species_from_country(self, country: str) -> AsyncGenerator[Species, None]:
+        """Yields species in the country as the response arrives.
+
+        Same as `species_from_country` but the memory use stays flat whatever the number of the species.
+
+        Parameters
+        ----------
+        country: str
+            2-character ISO code of the country.
+            If it is not a ISO code, it will be converted to the code via `pycountry`.
+
+        Yields
+        ------
+        :class:`Species`
+        """
+        if len(country) != 2:
+            import pycountry
+            country = pycountry.countries.lookup(country).alpha_2
+        async for sp in self.iter_results(f'/api/v3/country/getspecies/{country}'):
+            species = Species(self, sp['taxonid'], sp['scientific_name'])
+            species.category = sp.get('category')
+            yield species
 
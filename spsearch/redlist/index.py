@@ -0,0 +1,154 @@
+import sqlite3
+import time
+from os import PathLike
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple, Union
+from ..asynctools import bounded_as_completed
+
+if TYPE_CHECKING:
+    from .handler import RedListApiHandler
+
+categories = ("DD", "LC", "NT", "VU", "EN", "CR", "EW", "EX", "LR/lc", "LR/nt", "LR/cd")
+
+
+class SpeciesIndex:
+    """Local index of the Red List species backed by SQLite.
+
+    Once built, `RedListApiHandler(token, index=SpeciesIndex(path))` answers lookups by name, synonym, ID and
+    category from this index, and falls back to the API only when it misses.
+
+    Example
+    =======
+    index = SpeciesIndex('redlist.sqlite')
+    await index.build(handler, synonyms=True)
+
+    or from the command line:
+        python -m spsearch.redlist.index .redlist.token redlist.sqlite --synonyms
+
+    Parameters
+    ----------
+    path: str or PathLike, default ':memory:'
+        SQLite database file.
+    """
+    def __init__(self, path: Union[str, PathLike] = ':memory:'):
+        self.path = str(path)
+        self._db = sqlite3.connect(self.path)
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS species (
+                taxonid INTEGER PRIMARY KEY,
+                scientific_name TEXT NOT NULL,
+                category TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS species_scientific_name ON species (scientific_name);
+            CREATE INDEX IF NOT EXISTS species_category ON species (category);
+            CREATE TABLE IF NOT EXISTS synonyms (
+                synonym TEXT NOT NULL,
+                accepted_id INTEGER NOT NULL,
+                accepted_name TEXT,
+                authority TEXT,
+                syn_authority TEXT,
+                PRIMARY KEY (synonym, accepted_id)
+            );
+            CREATE TABLE IF NOT EXISTS categories (
+                category TEXT PRIMARY KEY,
+                built_at REAL NOT NULL
+            );
+        ''')
+
+    async def build(self, handler: 'RedListApiHandler', categories: Iterable[str] = categories,
+                    synonyms: bool = False, concurrency: int = 10):
+        """(Re)builds the index from the API.
+
+        Parameters
+        ----------
+        handler: RedListApiHandler
+        categories: Iterable of str, default all the categories
+        synonyms: bool, default False
+            If True, also gets the synonyms of every indexed species, which is one request per species.
+        concurrency: int, default 10
+            number of synonym requests in flight at once.
+        """
+        categories = list(categories)
+        # Unmark the categories first, so that the handler does not answer from the index being rebuilt
+        self._db.executemany('DELETE FROM categories WHERE category = ?', [(c,) for c in categories])
+        self._db.commit()
+        for category in categories:
+            species = await handler.species_from_category(category)
+            self._db.execute('DELETE FROM species WHERE category = ?', (category,))
+            self._db.executemany('REPLACE INTO species (taxonid, scientific_name, category) VALUES (?, ?, ?)',
+                                 [(taxonid, name, category) for taxonid, name, _ in species.rows()])
+            self._db.execute('REPLACE INTO categories (category, built_at) VALUES (?, ?)', (category, time.time()))
+            self._db.commit()
+
+        if synonyms:
+            names = [row[0] for row in self._db.execute('SELECT scientific_name FROM species')]
+            async for name, data in bounded_as_completed(
+                    lambda n: handler.get(f'/api/v3/species/synonym/{n}'), names, concurrency):
+                if isinstance(data, Exception) or not data['count']:
+                    continue
+                self._db.executemany(
+                    'REPLACE INTO synonyms (synonym, accepted_id, accepted_name, authority, syn_authority) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    [(r['synonym'], r['accepted_id'], r['accepted_name'], r['authority'], r['syn_authority'])
+                     for r in data['result']])
+                self._db.commit()
+
+    def has_category(self, category: str) -> bool:
+        """Whether the species in the category are indexed."""
+        return self._db.execute('SELECT 1 FROM categories WHERE category = ?', (category,)).fetchone() is not None
+
+    def by_id(self, taxonid: Union[str, int]) -> Optional[Tuple[int, str, str]]:
+        """Returns (taxonid, scientific_name, category) for the current taxon ID, or None."""
+        return self._db.execute('SELECT taxonid, scientific_name, category FROM species WHERE taxonid = ?',
+                                (int(taxonid),)).fetchone()
+
+    def by_name(self, name: str) -> Optional[Tuple[int, str, str]]:
+        """Returns (taxonid, scientific_name, category) for the accepted name or a synonym, or None.
+        Synonyms take precedence as `RedListApiHandler.species_from_name` does.
+        """
+        row = self._db.execute('SELECT accepted_id FROM synonyms WHERE synonym = ?', (name,)).fetchone()
+        if row is not None:
+            return self.by_id(row[0])
+        return self._db.execute('SELECT taxonid, scientific_name, category FROM species WHERE scientific_name = ?',
+                                (name,)).fetchone()
+
+    def by_category(self, category: str) -> List[Tuple[int, str, str]]:
+        """Returns list of (taxonid, scientific_name, category) in the category."""
+        return self._db.execute('SELECT taxonid, scientific_name, category FROM species WHERE category = ? '
+                                'ORDER BY taxonid', (category,)).fetchall()
+
+    def synonyms(self, taxonid: Union[str, int]) -> List[dict]:
+        """Returns the synonym records of the taxon in the same shape as the API."""
+        cursor = self._db.execute('SELECT accepted_id, accepted_name, authority, synonym, syn_authority '
+                                  'FROM synonyms WHERE accepted_id = ?', (int(taxonid),))
+        keys = [column[0] for column in cursor.description]
+        return [dict(zip(keys, row)) for row in cursor]
+
+    def close(self):
+        self._db.close()
+
+    def __len__(self):
+        return self._db.execute('SELECT COUNT(*) FROM species').fetchone()[0]
+
+
+if __name__ == '__main__':
+    import argparse
+    import asyncio
+    from .handler import RedListApiHandler
+
+    parser = argparse.ArgumentParser(description='Builds a local index of the Red List species.')
+    parser.add_argument('token', help='file which contains the Red List API token')
+    parser.add_argument('path', help='SQLite database file to build')
+    parser.add_argument('--synonyms', action='store_true', help='get the synonyms as well (slow)')
+    parser.add_argument('--category', action='append', choices=categories,
+                        help='category to index. Repeat it for more. Defaults to all.')
+    args = parser.parse_args()
+
+    async def main():
+        with open(args.token, encoding='utf-8') as token:
+            handler = RedListApiHandler(token)
+        async with handler:
+            index = SpeciesIndex(args.path)
+            await index.build(handler, categories=args.category or categories, synonyms=args.synonyms)
+            print(f'{len(index)} species indexed in {args.path}')
+
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+import sqlite3
+import time
+from os import PathLike
+from typing import Dict, Optional, Tuple, Union
+
+
+class RedirectMap:
+    """Map of old taxon IDs to the current ones, learnt from the taxonredirect requests.
+
+    Entries are kept in memory and, given a path, persisted in SQLite for the later runs.
+
+    Parameters
+    ----------
+    path: str or PathLike, default ':memory:'
+        SQLite database file. ':memory:' does not persist the map.
+    ttl: float or None, default 2592000 (30 days)
+        Seconds a mapping stays valid, as IDs may be redirected again. None keeps them forever.
+    """
+    def __init__(self, path: Union[str, PathLike] = ':memory:', ttl: Optional[float] = 2592000):
+        self.path = str(path)
+        self.ttl = ttl
+        self._db = sqlite3.connect(self.path)
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS redirects (
+                old_id INTEGER PRIMARY KEY,
+                current_id INTEGER NOT NULL,
+                ensured INTEGER NOT NULL,
+                resolved_at REAL NOT NULL
+            )
+        ''')
+        self._db.commit()
+
+        # old_id -> (current_id, ensured, resolved_at)
+        self._map: Dict[int, Tuple[int, bool, float]] = {}
+        since = 0 if ttl is None else time.time() - ttl
+        for old_id, current_id, ensured, resolved_at in self._db.execute(
+                'SELECT old_id, current_id, ensured, resolved_at FROM redirects WHERE resolved_at > ?', (since,)):
+            self._map[old_id] = (current_id, bool(ensured), resolved_at)
+
+    def get(self, id: Union[str, int], ensured: bool = False) -> Optional[int]:
+        """Returns the current ID for `id`, or None if it is unknown or expired.
+
+        Parameters
+        ----------
+        id: str or int
+        ensured: bool, default False
+            If True, only the mappings which followed the whole redirect chain
+            (by `species_from_id_ensured`) are returned.
+        """
+        entry = self._map.get(int(id))
+        if entry is None:
+            return None
+        current_id, entry_ensured, resolved_at = entry
+        if self.ttl is not None and resolved_at + self.ttl <= time.time():
+            del self._map[int(id)]
+            return None
+        if ensured and not entry_ensured:
+            return None
+        return current_id
+
+    def set(self, id: Union[str, int], current_id: int, ensured: bool = False):
+        old = self._map.get(int(id))
+        if old is not None and old[1] and not ensured and old[0] == current_id:
+            # Do not downgrade an ensured mapping
+            ensured = True
+        resolved_at = time.time()
+        self._map[int(id)] = (current_id, ensured, resolved_at)
+        self._db.execute('REPLACE INTO redirects (old_id, current_id, ensured, resolved_at) VALUES (?, ?, ?, ?)',
+                         (int(id), current_id, int(ensured), resolved_at))
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+    def __len__(self):
+        return len(self._map)
+
+    def __contains__(self, id: Union[str, int]):
+        return self.get(id) is not None
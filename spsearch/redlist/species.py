@@ -1,3 +1,4 @@
+import asyncio
 from typing import TYPE_CHECKING, Union, Mapping, List, MutableSequence
 from ..classes import AttrDict, AttrSeq
 from .classes import CodeHierarchySeq, Synonym
@@ -14,6 +15,9 @@ class Species:
     """Represents a species.
     Only id (and maybe name) parameter is available before executing `get_info`.
 
+    The information got by `get_info` is kept once in `_data`, and the attributes below
+    from `kingdom` to `amended_reason` are read from it.
+
     Attributes
     -----------
     handler: RedListApiHandler
@@ -54,7 +58,18 @@ class Species:
     errata_reason
     amended_flag
     amended_reason
+    habitats: CodeHierarchySeq
+        Set by `get_habitats` or `fetch_all`. None until then.
+    threats: CodeHierarchySeq
+        Set by `get_threats` or `fetch_all`. None until then.
+    conservation_measures: CodeHierarchySeq
+        Set by `get_conservation_measures` or `fetch_all`. None until then.
+    countries: List of AttrDict
+        Set by `get_country_occurrence` or `fetch_all`. None until then.
     """
+    __slots__ = ('_data', 'category', 'got_info', 'handler', 'taxonid', 'scientific_name', 'synonyms',
+                 'habitats', 'threats', 'conservation_measures', 'countries')
+
     def __init__(self, handler: 'RedListApiHandler', id: Union[str, int],
                  name: str = None, synonyms: List[Synonym] = None):
         self._data = None
@@ -64,6 +79,17 @@ class Species:
         self.taxonid = int(id)
         self.scientific_name = name
         self.synonyms = synonyms
+        self.habitats = None
+        self.threats = None
+        self.conservation_measures = None
+        self.countries = None
+
+    def __getattr__(self, item):
+        # Only called for the attributes which are not slots, i.e. the information in `_data`
+        key = 'class' if item == 'class_' else item
+        if not item.startswith('_') and self._data is not None and key in self._data:
+            return self._data[key]
+        raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{item}'")
 
     @property
     def id(self):
@@ -119,18 +145,15 @@ class Species:
         data = await self.handler.get(f'/api/v3/species/id/{self.id}')
         result = data['result'][0]
 
+        self._set_info(result)
+        return AttrDict(result)
+
+    def _set_info(self, result: Mapping):
+        """Sets the information got from the API (a record of `/api/v3/species/id/{id}` or the like)."""
         self.got_info = True
         self._data = result
         self.scientific_name = result['scientific_name']
-
-        for key in result:
-            if key == 'class':
-                setattr(self, key + '_', result[key])
-            if key == 'authority':
-                pass
-            else:
-                setattr(self, key, result[key])
-        return AttrDict(result)
+        self.category = result['category']
 
     async def get_habitats(self) -> CodeHierarchySeq:
         """Returns information about habitats of the species.
@@ -140,7 +163,8 @@ class Species:
         List of `Habitat`
         """
         data = await self.handler.get(f'/api/v3/habitats/species/id/{self.id}')
-        return CodeHierarchySeq(Habitat(data=AttrDict(hab)) for hab in data['result'])
+        self.habitats = CodeHierarchySeq(Habitat(data=AttrDict(hab)) for hab in data['result'])
+        return self.habitats
 
     async def get_threats(self) -> CodeHierarchySeq:
         """Returns information about threats of the species.
@@ -150,7 +174,8 @@ class Species:
         List of `Threat`
         """
         data = await self.handler.get(f'/api/v3/threats/species/id/{self.id}')
-        return CodeHierarchySeq(Threat(data=AttrDict(th)) for th in data['result'])
+        self.threats = CodeHierarchySeq(Threat(data=AttrDict(th)) for th in data['result'])
+        return self.threats
 
     async def get_conservation_measures(self) -> CodeHierarchySeq:
         """Returns information about conservation measures of the species.
@@ -160,7 +185,9 @@ class Species:
         List of `ConservationMeasure`
         """
         data = await self.handler.get(f'/api/v3/measures/species/id/{self.id}')
-        return CodeHierarchySeq(ConservationMeasure(data=AttrDict(con)) for con in data['result'])
+        self.conservation_measures = CodeHierarchySeq(ConservationMeasure(data=AttrDict(con))
+                                                      for con in data['result'])
+        return self.conservation_measures
 
     async def get_country_occurrence(self) -> MutableSequence[AttrDict]:
         """Returns list of countries in which the species exists or existed.
@@ -179,4 +206,30 @@ class Species:
         List of `AttrDict`
         """
         data = await self.handler.get(f'/api/v3/species/countries/id/{self.id}')
-        return AttrSeq(data['result'])
+        self.countries = AttrSeq(data['result'])
+        return self.countries
+
+    async def fetch_all(self) -> 'Species':
+        """Gets information, habitats, threats, conservation measures and countries at once.
+
+        The requests are made concurrently, and the ones already done are skipped.
+        The results are set to the attributes; `habitats`, `threats`, `conservation_measures` and `countries`.
+
+        Returns
+        -------
+        :class:`Species`
+            This species itself.
+        """
+        requests = []
+        if not self.got_info:
+            requests.append(self.get_info())
+        if self.habitats is None:
+            requests.append(self.get_habitats())
+        if self.threats is None:
+            requests.append(self.get_threats())
+        if self.conservation_measures is None:
+            requests.append(self.get_conservation_measures())
+        if self.countries is None:
+            requests.append(self.get_country_occurrence())
+        await asyncio.gather(*requests)
+        return self
@@ -0,0 +1,100 @@
+from array import array
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+from .species import Species
+
+if TYPE_CHECKING:
+    from .handler import RedListApiHandler
+
+
+class SpeciesTable(Sequence):
+    """Columnar list of species, returned by the endpoints which list many species.
+
+    Taxon IDs are held in an array, categories as codes into a table of the distinct categories,
+    and names in one shared string, so a whole category takes a fraction of the memory of `Species` objects.
+    `Species` is made only when a row is accessed.
+
+    Example
+    =======
+    table = await handler.species_from_category('LC')
+    table[0]                # <Species [LC]...>
+    table.ids               # array('q', [...])
+    for taxonid, name, category in table.rows():
+        ...
+    """
+    __slots__ = ('handler', 'ids', '_codes', '_categories', '_category_codes', '_names', '_offsets', '_pending')
+
+    def __init__(self, handler: 'RedListApiHandler', rows: Iterable[Tuple[int, str, Optional[str]]] = ()):
+        self.handler = handler
+        self.ids = array('q')
+        self._codes = array('B')
+        self._categories: List[Optional[str]] = []
+        self._category_codes: Dict[Optional[str], int] = {}
+        self._names = ''
+        self._offsets = array('I', [0])
+        self._pending: List[str] = []
+        for taxonid, name, category in rows:
+            self.append(taxonid, name, category)
+
+    @classmethod
+    def from_results(cls, handler: 'RedListApiHandler', results: Iterable[Mapping],
+                     category: str = None) -> 'SpeciesTable':
+        """Makes a table from the 'result' records of the API.
+        `category` is used for the records without one (e.g. the ones of `/api/v3/species/category/`).
+        """
+        table = cls(handler)
+        for sp in results:
+            table.append(sp['taxonid'], sp['scientific_name'], sp.get('category', category))
+        return table
+
+    def append(self, taxonid: Union[str, int], name: str, category: str = None):
+        code = self._category_codes.get(category)
+        if code is None:
+            code = self._category_codes[category] = len(self._categories)
+            self._categories.append(category)
+        self.ids.append(int(taxonid))
+        self._codes.append(code)
+        name = name or ''
+        self._pending.append(name)
+        self._offsets.append(self._offsets[-1] + len(name))
+
+    def _flush(self):
+        if self._pending:
+            self._names += ''.join(self._pending)
+            self._pending = []
+
+    def name(self, i: int) -> Optional[str]:
+        self._flush()
+        if i < 0:
+            i += len(self)
+        return self._names[self._offsets[i]:self._offsets[i + 1]] or None
+
+    def category(self, i: int) -> Optional[str]:
+        return self._categories[self._codes[i]]
+
+    def rows(self) -> Iterator[Tuple[int, Optional[str], Optional[str]]]:
+        """Yields (taxonid, scientific_name, category) without making `Species`."""
+        self._flush()
+        names, offsets, categories = self._names, self._offsets, self._categories
+        for i, (taxonid, code) in enumerate(zip(self.ids, self._codes)):
+            yield taxonid, names[offsets[i]:offsets[i + 1]] or None, categories[code]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return SpeciesTable(self.handler, ((self.ids[j], self.name(j), self.category(j))
+                                               for j in range(len(self))[i]))
+        species = Species(self.handler, self.ids[i], self.name(i))
+        species.category = self.category(i)
+        return species
+
+    def __iter__(self):
+        for taxonid, name, category in self.rows():
+            species = Species(self.handler, taxonid, name)
+            species.category = category
+            yield species
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} of {len(self)} species>'
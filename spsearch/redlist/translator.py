@@ -1,27 +1,79 @@
-from typing import Union
+from typing import Dict, Iterable, List, Optional, Union
 from os import PathLike
 from pathlib import Path
 import csv
+import marshal
+import os
 
 
 class Translator:
     """
+    Dictionaries are loaded lazily for each language on the first translation.
+    A parsed dictionary is cached in `__pycache__` under the directory,
+    and parsed again only when its CSV file has changed.
+
     Parameters
     ----------
     dir_set : str or PathLike
         representative of directory which contains CSV dictionary.
     """
     def __init__(self, dir_set: Union[str, PathLike]):
-        self.dictionary = {}
-        if isinstance(dir_set, str):
-            dir_set = Path(dir_set)
-        for p in dir_set.glob('*.csv'):
-            with p.open('r', encoding='utf-8') as f:
-                reader = csv.reader(f, delimiter='\t')
-                self.dictionary[p.stem] = {}
-                for row in reader:
-                    if row:
-                        self.dictionary[p.stem].update({row[0]: row[2]})
+        self.dir = Path(dir_set)
+        self._dictionaries: Dict[str, Dict[str, str]] = {}
+
+    @property
+    def dictionary(self) -> Dict[str, Dict[str, str]]:
+        """Dictionaries of all the languages, which are loaded at once."""
+        for lang in self.languages():
+            self._load(lang)
+        return self._dictionaries
+
+    def languages(self) -> List[str]:
+        """Returns the languages available."""
+        return sorted(p.stem for p in self.dir.glob('*.csv'))
+
+    def _load(self, lang: str) -> Dict[str, str]:
+        try:
+            return self._dictionaries[lang]
+        except KeyError:
+            pass
+
+        source = self.dir / f'{lang}.csv'
+        try:
+            stat = source.stat()
+        except OSError:
+            # Unknown language. Remember it to avoid looking for the file again.
+            self._dictionaries[lang] = {}
+            return self._dictionaries[lang]
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        cache = self.dir / '__pycache__' / f'{lang}.marshal'
+        try:
+            with cache.open('rb') as f:
+                cached_signature, dictionary = marshal.load(f)
+            if tuple(cached_signature) == signature and isinstance(dictionary, dict):
+                self._dictionaries[lang] = dictionary
+                return dictionary
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+        dictionary = {}
+        with source.open('r', encoding='utf-8') as f:
+            for row in csv.reader(f, delimiter='\t'):
+                if row:
+                    dictionary[row[0]] = row[2]
+        self._dictionaries[lang] = dictionary
+
+        # Best effort, as the package directory may be read-only
+        try:
+            cache.parent.mkdir(exist_ok=True)
+            temporary = cache.with_name(f'{cache.name}.{os.getpid()}.tmp')
+            with temporary.open('wb') as f:
+                marshal.dump((signature, dictionary), f)
+            os.replace(str(temporary), str(cache))
+        except OSError:
+            pass
+        return dictionary
 
     def translate(self, lang: str, code: str) -> Union[str, None]:
         """Translate the code.
@@ -38,7 +90,21 @@ class Translator:
         -------
         str
         """
-        try:
-            return self.dictionary[lang][code]
-        except KeyError:
-            return None
+        return self._load(lang).get(code)
+
+    def translate_many(self, lang: str, codes: Iterable) -> List[Optional[str]]:
+        """Translate many codes at once.
+
+        Parameters
+        ----------
+        lang : str
+            Destination language.
+        codes : Iterable of str, or of objects with `code` (e.g. `CodeHierarchySeq`)
+            Codes to translate.
+
+        Returns
+        -------
+        List of str or None
+        """
+        dictionary = self._load(lang)
+        return [dictionary.get(code if isinstance(code, str) else code.code) for code in codes]
@@ -0,0 +1,68 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Coalesces identical concurrent calls into one.
+
+    While a call for a key is in flight, later calls for the same key wait for it
+    and share its result (or exception) instead of starting their own.
+
+    Attributes
+    ----------
+    hits: int
+        Number of calls which were served by a call already in flight.
+    misses: int
+        Number of calls which actually ran.
+    """
+    def __init__(self):
+        # key -> [future, number of waiters]
+        self._calls: Dict[Hashable, list] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable], *args, **kwargs) -> Any:
+        """Runs `func(*args, **kwargs)` unless a call for `key` is already in flight.
+
+        Cancelling one waiter does not cancel the shared call for the others.
+        The shared call is cancelled only when all of its waiters are.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            self.misses += 1
+            future = asyncio.ensure_future(func(*args, **kwargs))
+            call = self._calls[key] = [future, 0]
+            future.add_done_callback(lambda f: self._done(key, f))
+        else:
+            self.hits += 1
+
+        future = call[0]
+        call[1] += 1
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if call[1] == 1:
+                future.cancel()
+            raise
+        finally:
+            call[1] -= 1
+
+    def cancel(self):
+        """Cancels all the calls in flight."""
+        for future, _ in self._calls.values():
+            future.cancel()
+
+    def _done(self, key: Hashable, future: asyncio.Future):
+        if key in self._calls and self._calls[key][0] is future:
+            del self._calls[key]
+        # Mark the exception as retrieved even if every waiter has been cancelled
+        if not future.cancelled():
+            future.exception()
+
+    def __len__(self):
+        return len(self._calls)
@@ -0,0 +1,43 @@
+import asyncio
+import pytest
+from spsearch.eol.cypher.aggregate import TraitAggregation
+from .test_cypher import StubExecutor
+
+
+def test_query_by_predicate_and_units():
+    aggregation = TraitAggregation(by=('predicate', 'units'), pages=[46559130, 'Lutra lutra'], category='body mass')
+    assert aggregation.count().avg().max().query() == '\n'.join([
+        'MATCH (p:Page) WHERE p.page_id IN [46559130] OR p.canonical IN ["Lutra lutra"]',
+        'MATCH (p)-[:trait]->(t:Trait), (t)-[:predicate]->(pred:Term)',
+        'WHERE pred.name = "body mass"',
+        'OPTIONAL MATCH (t)-[:normal_units_term]->(units:Term)',
+        'RETURN pred.uri AS predicate_uri, pred.name AS predicate, units.uri AS units_uri, units.name AS units, '
+        'COUNT(t) AS count, AVG(toFloat(t.normal_measurement)) AS avg, MAX(toFloat(t.normal_measurement)) AS max',
+        'ORDER BY predicate_uri, predicate, units_uri, units',
+    ])
+
+
+def test_query_needs_an_aggregate():
+    with pytest.raises(ValueError):
+        TraitAggregation().query()
+
+
+@pytest.mark.parametrize('add', [
+    lambda aggregation: aggregation.avg().avg('literal'),
+    lambda aggregation: aggregation.count().count(),
+    lambda aggregation: aggregation.aggregate('collect', 'units', alias='units'),
+])
+def test_duplicate_alias_is_rejected(add):
+    with pytest.raises(ValueError):
+        add(TraitAggregation(by=('predicate', 'units')))
+
+
+def test_aggregation_within_a_page_is_one_request():
+    async def main():
+        executor = StubExecutor(2)
+        summary = await executor.aggregate_traits(pages=[1])
+        return executor, summary
+
+    executor, summary = asyncio.run(main())
+    assert len(summary) == 2
+    assert len(executor.queries) == 1
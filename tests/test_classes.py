@@ -0,0 +1,38 @@
+import json
+from spsearch.classes import AttrDict, AttrSeq
+
+
+def payload() -> dict:
+    return {'count': 2, 'result': [{'code': 'JP', 'country': 'Japan'}, {'code': 'KR', 'country': 'Korea'}],
+            'name': {'scientific': 'Lutra lutra'}}
+
+
+def test_nested_access():
+    data = payload()
+    d = AttrDict(data)
+    assert isinstance(d, dict) and isinstance(d.result, list)
+    assert d.result[1].code == 'KR'
+    assert d.result is d.result
+    assert [c.code for c in d.result] == ['JP', 'KR']
+    assert d.result[:1][0].code == 'JP'
+    assert json.loads(json.dumps(d)) == data == payload()
+
+
+def test_dict_methods_wrap_nested_values():
+    d = AttrDict(payload())
+    assert d.get('name').scientific == 'Lutra lutra'
+    assert [v for k, v in d.items() if k == 'result'][0][0].code == 'JP'
+    assert d.setdefault('name').scientific == 'Lutra lutra'
+    assert d.setdefault('synonyms', [{'name': 'x'}])[0].name == 'x'
+    assert d.pop('name').scientific == 'Lutra lutra'
+    assert d.pop('missing', None) is None
+    key, value = d.popitem()
+    assert key == 'synonyms' and value[0].name == 'x'
+
+
+def test_seq_methods_wrap_nested_values():
+    seq = AttrSeq(payload()['result'])
+    assert [c.code for c in reversed(seq)] == ['KR', 'JP']
+    assert seq.pop().code == 'KR'
+    assert seq.pop(0).country == 'Japan'
+    assert seq == []
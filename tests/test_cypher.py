@@ -0,0 +1,47 @@
+import asyncio
+import re
+import pytest
+from spsearch.eol.cypher.core import CypherExecutor
+
+
+class StubExecutor(CypherExecutor):
+    """Answers each page from `rows` rows without a request, recording the queries."""
+    def __init__(self, rows: int):
+        super().__init__('token')
+        self.rows = rows
+        self.queries = []
+
+    async def _request(self, query, session):
+        self.queries.append(query)
+        skip, limit = map(int, re.search(r'SKIP (\d+) LIMIT (\d+)$', query).groups())
+        return {'columns': ['n'], 'data': [[i] for i in range(skip, min(skip + limit, self.rows))]}
+
+
+@pytest.mark.parametrize('rows', [0, 3, 9, 10, 25, 40])
+def test_execute_iter_fetches_more_pages_only_after_a_full_one(rows):
+    async def main():
+        executor = StubExecutor(rows)
+        result = [row[0] async for row in executor.execute_iter('MATCH (n) RETURN n', chunk=10, concurrency=4)]
+        return executor, result
+
+    executor, result = asyncio.run(main())
+    assert result == list(range(rows))
+    assert executor.queries[0].endswith('SKIP 0 LIMIT 10')
+    # A result within a page costs one request, however many pages may be fetched at once
+    if rows < 10:
+        assert len(executor.queries) == 1
+    else:
+        assert len(executor.queries) > rows // 10
+
+
+@pytest.mark.parametrize('items, requests', [(0, 0), (5, 1), (10, 1), (30, 3)])
+def test_execute_fetches_up_to_items(items, requests):
+    async def main():
+        executor = StubExecutor(100)
+        result = [row async for result in executor._paginate('q', items=items, chunk=10, concurrency=4)
+                  for row in result['data']]
+        return executor, result
+
+    executor, result = asyncio.run(main())
+    assert len(result) == items
+    assert len(executor.queries) == requests
@@ -0,0 +1,41 @@
+import asyncio
+import json
+import pytest
+from spsearch.jsonstream import _Reader, iter_json_array
+
+documents = [
+    '{"result": [1.5]}',
+    '{"result": [12.5, 3]}',
+    '{"result": [1e5, -2, -0.25E-3, 0]}',
+    '{"count": 12.75, "result": [{"code": "1.2", "score": 3.5}, {"code": "10", "score": -1}], "name": "x"}',
+    '{"name": "a, b]", "result": [[1, 2.5], {"nested": {"value": 100}}, "text", true, null]}',
+    '{ "result" : [ 123456 , 7 ] }',
+    '{"result": []}',
+    '{"count": 3}',
+]
+
+
+async def _chunks(text: str, size: int):
+    data = text.encode()
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+async def _collect(text: str, size: int) -> list:
+    return [item async for item in iter_json_array(_chunks(text, size), 'result')]
+
+
+@pytest.mark.parametrize('document', documents)
+@pytest.mark.parametrize('size', range(1, 9))
+def test_iter_json_array_whatever_the_chunks(document, size):
+    expected = json.loads(document).get('result', [])
+    assert asyncio.run(_collect(document, size)) == expected
+
+
+@pytest.mark.parametrize('text', ['1e5', '-2', '12.5', '0.125'])
+@pytest.mark.parametrize('size', range(1, 4))
+def test_number_at_end_of_stream(text, size):
+    async def main():
+        return await _Reader(_chunks(text, size)).value()
+
+    assert asyncio.run(main()) == json.loads(text)
@@ -0,0 +1,17 @@
+import asyncio
+from spsearch.eol.cypher.page import Page
+from .test_cypher import StubExecutor
+
+
+def test_get_traits_many_resolves_a_name_as_from_names():
+    async def main():
+        executor = StubExecutor(0)
+        traits = await Page.get_traits_many(executor, [46559130, 'Lutra lutra'])
+        return executor, traits
+
+    executor, traits = asyncio.run(main())
+    assert traits == {46559130: [], 'Lutra lutra': []}
+    by_id, by_name = executor.queries
+    assert 'MATCH (p:Page {page_id: key})' in by_id
+    assert 'WITH key, min(q.page_id) AS page_id MATCH (p:Page {page_id: page_id})' in by_name
+    assert all('ORDER BY key, p.page_id, t.eol_pk' in query for query in executor.queries)
@@ -0,0 +1,32 @@
+import asyncio
+import time
+from spsearch.ratelimit import TokenBucket
+
+
+def test_cancelled_acquire_gives_token_back():
+    async def main():
+        bucket = TokenBucket(rate=10, capacity=1)
+        await bucket.acquire()
+        waiters = [asyncio.ensure_future(bucket.acquire()) for _ in range(5)]
+        await asyncio.sleep(0)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        assert all(waiter.cancelled() for waiter in waiters)
+
+        # Only the first acquire is owed, so the next token comes in about 1 / rate seconds
+        start = time.monotonic()
+        await bucket.acquire()
+        assert time.monotonic() - start < 0.2
+
+    asyncio.run(main())
+
+
+def test_acquire_paces_waiters():
+    async def main():
+        bucket = TokenBucket(rate=20, capacity=1)
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(5)))
+        assert 0.15 < time.monotonic() - start < 0.5
+
+    asyncio.run(main())